@@ -0,0 +1,165 @@
+import numpy as np
+from vector import NEAR_ZERO_TOLERANCES, get_backend
+
+UNIQUE_SOLUTION = 0
+NO_SOLUTIONS = 1
+INF_SOLUTIONS = 2
+
+SYSTEMS_MUST_BE_SQUARE_MSG = ('Coefficients must be an N x n x n array and '
+                              'constant terms an N x n array')
+
+
+def stack_systems(systems):
+    """
+    Turns a list of systems, each one a LinearSystem or a list of
+    Line/Plane/Hyperplane objects, into the (coefficients, constant_terms)
+    arrays taken by the batch solvers
+    """
+    coefficients = [[p.normal_vector.coordinates for p in system]
+                    for system in systems]
+    constant_terms = [[p.constant_term for p in system]
+                      for system in systems]
+    return (np.array(coefficients, dtype=float),
+            np.array(constant_terms, dtype=float))
+
+
+def _determinants_and_numerators(coefficients, constant_terms):
+    """
+    Cramer's rule in closed form for 2x2 and 3x3 systems, returns
+    det(A) and the numerators adj(A) b of every system
+    """
+    size = coefficients.shape[1]
+
+    if size == 2:
+        a, b = coefficients[:, 0, 0], coefficients[:, 0, 1]
+        c, d = coefficients[:, 1, 0], coefficients[:, 1, 1]
+        k1, k2 = constant_terms[:, 0], constant_terms[:, 1]
+        determinants = a * d - b * c
+        numerators = np.stack([d * k1 - b * k2, -c * k1 + a * k2], axis=1)
+        return determinants, numerators
+
+    if size == 3:
+        row0, row1, row2 = (coefficients[:, 0], coefficients[:, 1],
+                            coefficients[:, 2])
+        cross12 = np.cross(row1, row2)
+        cross20 = np.cross(row2, row0)
+        cross01 = np.cross(row0, row1)
+        determinants = np.einsum('ij,ij->i', row0, cross12)
+        numerators = (constant_terms[:, 0:1] * cross12 +
+                      constant_terms[:, 1:2] * cross20 +
+                      constant_terms[:, 2:3] * cross01)
+        return determinants, numerators
+
+    determinants = np.linalg.det(coefficients)
+    numerators = np.zeros_like(constant_terms)
+    nonsingular = determinants != 0
+    numerators[nonsingular] = (
+        np.linalg.solve(coefficients[nonsingular],
+                        constant_terms[nonsingular][..., None])[..., 0] *
+        determinants[nonsingular, None])
+    return determinants, numerators
+
+
+def _normalize_rows(matrices):
+    """
+    Scales every nonzero row of a stack of matrices to unit length, so
+    rank tests with an absolute tolerance do not depend on the scale of
+    the equations
+    """
+    norms = np.sqrt(np.einsum('...ij,...ij->...i', matrices, matrices))
+    norms[norms == 0] = 1
+    return matrices / norms[..., None]
+
+
+def solve_batch(coefficients, constant_terms, eps=None):
+    """
+    Solves N independent n x n systems A x = b in one vectorized pass.
+
+    `coefficients` is N x n x n (one normal vector per row) and
+    `constant_terms` is N x n. 2x2 and 3x3 systems use Cramer's rule in
+    closed form, larger ones fall back to np.linalg. A system is singular
+    when |det(A)| is near zero relative to the product of its row norms,
+    with the same tolerance as MyDecimal.is_near_zero, so scaling an
+    equation does not change the verdict. Singular systems are then told
+    apart by comparing the rank of A with the rank of [A | b], both with
+    their rows normalized.
+
+    Returns (solutions, status): an N x n array with nan rows where there
+    is no unique solution, and an array of UNIQUE_SOLUTION, NO_SOLUTIONS or
+    INF_SOLUTIONS codes.
+    """
+    if eps is None:
+        eps = NEAR_ZERO_TOLERANCES[get_backend()]
+
+    coefficients = np.asarray(coefficients, dtype=float)
+    constant_terms = np.asarray(constant_terms, dtype=float)
+    if (coefficients.ndim != 3 or
+            coefficients.shape[1] != coefficients.shape[2] or
+            constant_terms.shape != coefficients.shape[:2]):
+        raise Exception(SYSTEMS_MUST_BE_SQUARE_MSG)
+
+    determinants, numerators = _determinants_and_numerators(coefficients,
+                                                            constant_terms)
+
+    row_norms = np.sqrt(np.einsum('ijk,ijk->ij', coefficients, coefficients))
+    singular = np.abs(determinants) <= eps * np.prod(row_norms, axis=1)
+    solutions = np.full(constant_terms.shape, np.nan)
+    status = np.full(len(determinants), UNIQUE_SOLUTION, dtype=np.int8)
+
+    unique = ~singular
+    solutions[unique] = numerators[unique] / determinants[unique, None]
+
+    if singular.any():
+        singular_coefficients = coefficients[singular]
+        augmented = np.concatenate(
+            [singular_coefficients, constant_terms[singular][..., None]],
+            axis=2)
+        coefficient_ranks = np.linalg.matrix_rank(
+            _normalize_rows(singular_coefficients), tol=eps)
+        augmented_ranks = np.linalg.matrix_rank(_normalize_rows(augmented),
+                                                tol=eps)
+        status[singular] = np.where(augmented_ranks > coefficient_ranks,
+                                    NO_SOLUTIONS, INF_SOLUTIONS)
+
+    return solutions, status
+
+
+def solve_2x2_batch(coefficients, constant_terms, eps=None):
+    """
+    Batch version of Line.intersection, see solve_batch
+    """
+    return solve_batch(coefficients, constant_terms, eps)
+
+
+def solve_3x3_batch(coefficients, constant_terms, eps=None):
+    """
+    Batch version of the intersection of three planes, see solve_batch
+    """
+    return solve_batch(coefficients, constant_terms, eps)
+
+
+if __name__ == '__main__':
+    # the three line systems from the course
+    coefficients = [[[4.046, 2.836], [10.115, 7.09]],
+                    [[7.204, 3.182], [8.172, 4.114]],
+                    [[1.182, 5.562], [1.773, 8.343]]]
+    constant_terms = [[1.21, 3.025], [8.68, 9.883], [6.744, 9.525]]
+    solutions, status = solve_2x2_batch(coefficients, constant_terms)
+    print('line solutions: {}'.format(np.round(solutions, 3).tolist()))
+    print('line status: {}'.format(status.tolist()))
+
+    coefficients = [[[1, 1, 1], [0, 1, 0], [1, 1, -1]],
+                    [[1, 1, 1], [1, 1, 1], [0, 1, 0]],
+                    [[1, 1, 1], [2, 2, 2], [0, 1, 0]]]
+    constant_terms = [[1, 2, 3], [1, 2, 3], [1, 2, 3]]
+    solutions, status = solve_3x3_batch(coefficients, constant_terms)
+    print('plane solutions: {}'.format(np.round(solutions, 3).tolist()))
+    print('plane status: {}'.format(status.tolist()))
+
+    # the same planes scaled down, singular only when |det| is compared
+    # without the row norms
+    coefficients = [1e-4 * np.eye(3), np.diag([1e-6, 1e-6, 1e-6])]
+    constant_terms = [[1e-4, 2e-4, 3e-4], [1e-6, 2e-6, 3e-6]]
+    solutions, status = solve_3x3_batch(coefficients, constant_terms)
+    print('scaled solutions: {}'.format(np.round(solutions, 3).tolist()))
+    print('scaled status: {}'.format(status.tolist()))
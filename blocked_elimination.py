@@ -0,0 +1,137 @@
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+from vector import NEAR_ZERO_TOLERANCES, FLOAT_BACKEND
+
+DEFAULT_BLOCK_SIZE = 128
+
+SYSTEM_MUST_BE_SQUARE_MSG = 'Blocked elimination needs a square system'
+SINGULAR_SYSTEM_MSG = 'The system has no unique solution'
+
+
+def _factor_panel(A, start, stop, permutation, eps):
+    """
+    Unblocked LU with partial pivoting of the panel A[start:, start:stop].
+    Row swaps are applied to the full rows of A.
+    """
+    for col in range(start, stop):
+        pivot_row = col + np.argmax(np.abs(A[col:, col]))
+        if abs(A[pivot_row, col]) < eps:
+            raise Exception(SINGULAR_SYSTEM_MSG)
+
+        if pivot_row != col:
+            A[[col, pivot_row]] = A[[pivot_row, col]]
+            permutation[[col, pivot_row]] = permutation[[pivot_row, col]]
+
+        A[col + 1:, col] /= A[col, col]
+        A[col + 1:, col + 1:stop] -= np.outer(A[col + 1:, col],
+                                              A[col, col + 1:stop])
+
+
+def blocked_lu(A, block_size=DEFAULT_BLOCK_SIZE, workers=None, eps=None):
+    """
+    Right-looking blocked LU factorization with partial pivoting, P A = L U,
+    computed in place in the float array A (unit L below the diagonal, U on
+    and above it). Returns the row permutation.
+
+    After every panel, the trailing submatrix update A22 -= L21 U12 is split
+    into column tiles that a pool of `workers` threads update in parallel on
+    the shared buffer. NumPy releases the GIL inside the matrix products,
+    so the tiles really run on separate cores. With workers=None the whole
+    update is a single product, which leaves the parallelism to the BLAS.
+    """
+    if eps is None:
+        eps = NEAR_ZERO_TOLERANCES[FLOAT_BACKEND]
+
+    n = A.shape[0]
+    permutation = np.arange(n)
+    pool = ThreadPool(workers) if workers and workers > 1 else None
+
+    try:
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            _factor_panel(A, start, stop, permutation, eps)
+            if stop == n:
+                break
+
+            unit_lower = np.tril(A[start:stop, start:stop], -1)
+            unit_lower[np.diag_indices(stop - start)] = 1
+            A[start:stop, stop:] = np.linalg.solve(unit_lower,
+                                                   A[start:stop, stop:])
+
+            lower = A[stop:, start:stop]
+            upper = A[start:stop, stop:]
+
+            def update_tile(columns):
+                tile_start, tile_stop = columns
+                A[stop:, tile_start:tile_stop] -= np.dot(
+                    lower, upper[:, tile_start - stop:tile_stop - stop])
+
+            if pool is None:
+                update_tile((stop, n))
+            else:
+                pool.map(update_tile, [(c, min(c + block_size, n))
+                                       for c in range(stop, n, block_size)])
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return permutation
+
+
+def lu_solve(lu, permutation, b, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Solves L U x = P b with blocked forward and back substitution
+    """
+    n = lu.shape[0]
+    y = np.asarray(b, dtype=float)[permutation]
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        unit_lower = np.tril(lu[start:stop, start:stop], -1)
+        unit_lower[np.diag_indices(stop - start)] = 1
+        y[start:stop] = np.linalg.solve(
+            unit_lower, y[start:stop] - np.dot(lu[start:stop, :start],
+                                               y[:start]))
+
+    x = y
+    for start in reversed(range(0, n, block_size)):
+        stop = min(start + block_size, n)
+        upper = np.triu(lu[start:stop, start:stop])
+        x[start:stop] = np.linalg.solve(
+            upper, x[start:stop] - np.dot(lu[start:stop, stop:], x[stop:]))
+
+    return x
+
+
+def solve_blocked(planes, block_size=DEFAULT_BLOCK_SIZE, workers=None):
+    """
+    Solves a square dense system given as a list of planes, returns the
+    solution as a float array. Raises when it has no unique solution.
+    """
+    A = np.array([p.normal_vector.coordinates for p in planes], dtype=float)
+    b = np.array([p.constant_term for p in planes], dtype=float)
+    if A.shape[0] != A.shape[1]:
+        raise Exception(SYSTEM_MUST_BE_SQUARE_MSG)
+
+    permutation = blocked_lu(A, block_size, workers)
+    return lu_solve(A, permutation, b, block_size)
+
+
+if __name__ == '__main__':
+    import time
+
+    random_state = np.random.RandomState(0)
+    size = 1500
+    A = random_state.standard_normal((size, size))
+    b = random_state.standard_normal(size)
+    expected = np.linalg.solve(A, b)
+
+    for workers in (None, 2, 4):
+        lu = A.copy()
+        started = time.time()
+        permutation = blocked_lu(lu, workers=workers)
+        x = lu_solve(lu, permutation, b)
+        print('workers {}: {:.3f}s, max error {:.2e}'.format(
+            workers, time.time() - started, np.abs(x - expected).max()))
@@ -0,0 +1,121 @@
+import numpy as np
+from vector import NEAR_ZERO_TOLERANCES, get_backend
+
+DEFAULT_POINT_CHUNK_SIZE = 65536
+
+HYPERPLANES_MUST_SHARE_DIM_MSG = ('Hyperplanes must be given as objects with '
+                                  'a normal vector and a constant term, or as '
+                                  'an H x (d + 1) array of [n, k] rows, and '
+                                  'the points as a P x d array')
+CANNOT_MEASURE_DISTANCE_TO_ZERO_NORMAL_MSG = ('Cannot measure distances to a '
+                                              'hyperplane with a zero normal '
+                                              'vector')
+
+
+def as_unit_hyperplane_arrays(hyperplanes):
+    """
+    Returns the H x d unit normal vectors and the H constant terms of
+    `hyperplanes` (Line, Plane or Hyperplane objects, or an H x (d + 1)
+    array of [n, k] rows), both scaled by 1 / |n| so n . x - k is the
+    signed distance from x
+    """
+    if not isinstance(hyperplanes, np.ndarray):
+        hyperplanes = [list(p.normal_vector.coordinates) + [p.constant_term]
+                       if hasattr(p, 'normal_vector') else p
+                       for p in hyperplanes]
+
+    hyperplanes = np.asarray(hyperplanes, dtype=float)
+    if hyperplanes.ndim != 2 or hyperplanes.shape[1] < 2:
+        raise Exception(HYPERPLANES_MUST_SHARE_DIM_MSG)
+
+    normals, constant_terms = hyperplanes[:, :-1], hyperplanes[:, -1]
+    magnitudes = np.sqrt(np.einsum('ij,ij->i', normals, normals))
+    if not magnitudes.all():
+        raise Exception(CANNOT_MEASURE_DISTANCE_TO_ZERO_NORMAL_MSG)
+
+    return normals / magnitudes[:, None], constant_terms / magnitudes
+
+
+def _signed_distances(points, unit_normals, constant_terms):
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != unit_normals.shape[1]:
+        raise Exception(HYPERPLANES_MUST_SHARE_DIM_MSG)
+
+    return np.dot(points, unit_normals.T) - constant_terms
+
+
+def signed_distances(points, hyperplanes):
+    """
+    P x H matrix of signed distances from every point to every hyperplane,
+    positive on the side the normal vector points to
+    """
+    unit_normals, constant_terms = as_unit_hyperplane_arrays(hyperplanes)
+    return _signed_distances(points, unit_normals, constant_terms)
+
+
+def classify_points(points, hyperplanes, eps=None):
+    """
+    Classifies a P x d point array against H hyperplanes in one vectorized
+    pass. Returns (distances, sides, nearest):
+
+    - distances: the P x H signed distances, see signed_distances
+    - sides: P x H int8 array, 1 or -1 for the positive or negative half
+      space and 0 for points within `eps` of the hyperplane
+    - nearest: for every point, the index of the closest hyperplane
+    """
+    if eps is None:
+        eps = NEAR_ZERO_TOLERANCES[get_backend()]
+
+    distances = signed_distances(points, hyperplanes)
+    return distances, _sides(distances, eps), _nearest(distances)
+
+
+def _sides(distances, eps):
+    sides = np.sign(distances).astype(np.int8)
+    sides[np.abs(distances) < eps] = 0
+    return sides
+
+
+def _nearest(distances):
+    return np.argmin(np.abs(distances), axis=1)
+
+
+def iter_point_chunks(points, chunk_size=DEFAULT_POINT_CHUNK_SIZE):
+    """
+    Slices a P x d point array into chunks of at most `chunk_size` points.
+    Each slice is converted to float on its own, so a point cloud kept in
+    an np.memmap is read one chunk at a time.
+    """
+    for start in range(0, len(points), chunk_size):
+        yield np.asarray(points[start:start + chunk_size], dtype=float)
+
+
+def iter_classify_points(point_chunks, hyperplanes, eps=None):
+    """
+    Streaming variant of classify_points. Takes any iterable of point
+    chunks (see iter_point_chunks) and yields (distances, sides, nearest)
+    for each of them. The hyperplanes are normalized only once.
+    """
+    if eps is None:
+        eps = NEAR_ZERO_TOLERANCES[get_backend()]
+
+    unit_normals, constant_terms = as_unit_hyperplane_arrays(hyperplanes)
+    for chunk in point_chunks:
+        distances = _signed_distances(chunk, unit_normals, constant_terms)
+        yield distances, _sides(distances, eps), _nearest(distances)
+
+
+if __name__ == '__main__':
+    # the coordinate planes z = 0 and x = 1, and the plane x + y + z = 1
+    hyperplanes = [[0, 0, 1, 0], [2, 0, 0, 2], [1, 1, 1, 1]]
+    points = [[0, 0, 0], [1, 2, 3], [0.5, 0.5, -1], [2, 0, 0]]
+
+    distances, sides, nearest = classify_points(points, hyperplanes)
+    print('signed distances: {}'.format(np.round(distances, 3).tolist()))
+    print('sides: {}'.format(sides.tolist()))
+    print('nearest hyperplanes: {}'.format(nearest.tolist()))
+
+    chunks = iter_point_chunks(np.array(points), chunk_size=3)
+    for distances, sides, nearest in iter_classify_points(chunks,
+                                                          hyperplanes):
+        print('streamed nearest hyperplanes: {}'.format(nearest.tolist()))
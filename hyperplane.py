@@ -1,39 +1,61 @@
-from decimal import Decimal, getcontext
-from vector import Vector
+from decimal import getcontext
+from math import ceil, log10
+from vector import (BACKEND_CONVERTERS, NEAR_ZERO_TOLERANCES, Vector,
+                    is_near_zero)
 
 getcontext().prec = 30
 
 
-class MyDecimal(Decimal):
-    def is_near_zero(self, eps=1e-10):
-        return abs(self) < eps
+class Hyperplane(object):
+    """
+    Equation normal_vector . x = constant_term. Also the shared core of Line
+    and Plane, which only fix the dimension.
 
+    Instances are slotted, and the basepoint is only computed the first time
+    it is used, since most hyperplanes built during elimination never need
+    it.
+    """
 
-class Hyperplane(object):
+    __slots__ = ('dimension', 'normal_vector', 'constant_term', 'backend',
+                 '_basepoint', '_canonical_form', 'current')
 
     NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
     EITHER_DIM_OR_NORMAL_VEC_MUST_BE_PROVIDED_MSG = (
         'Either the dimension of the hyperplane or the normal vector '
         'must be provided')
+    NORMAL_VEC_MUST_MATCH_DIM_MSG = ('The normal vector must live in the '
+                                     'dimension of the hyperplane')
 
-    def __init__(self, dimension=None, normal_vector=None, constant_term=None):
+    def __init__(self, dimension=None, normal_vector=None, constant_term=None,
+                 backend=None):
         if not dimension and not normal_vector:
             raise Exception(self.EITHER_DIM_OR_NORMAL_VEC_MUST_BE_PROVIDED_MSG)
 
         elif not normal_vector:
             self.dimension = dimension
             all_zeros = ['0'] * self.dimension
-            normal_vector = Vector(all_zeros)
+            normal_vector = Vector(all_zeros, backend)
         else:
+            if dimension and dimension != normal_vector.dimension:
+                raise Exception(self.NORMAL_VEC_MUST_MATCH_DIM_MSG)
             self.dimension = normal_vector.dimension
+            if backend and backend != normal_vector.backend:
+                normal_vector = Vector(normal_vector.coordinates, backend)
 
         self.normal_vector = normal_vector
 
+        self.backend = normal_vector.backend
         if not constant_term:
-            constant_term = Decimal('0')
-        self.constant_term = Decimal(constant_term)
+            constant_term = '0'
+        self.constant_term = BACKEND_CONVERTERS[self.backend](constant_term)
 
-        self.set_basepoint()
+    @property
+    def basepoint(self):
+        try:
+            return self._basepoint
+        except AttributeError:
+            self.set_basepoint()
+            return self._basepoint
 
     def set_basepoint(self):
         try:
@@ -45,11 +67,11 @@ class Hyperplane(object):
             initial_coefficient = n[initial_index]
 
             basepoint_coords[initial_index] = c / initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            self._basepoint = Vector(basepoint_coords, self.backend)
 
         except Exception as e:
             if str(e) == Hyperplane.NO_NONZERO_ELTS_FOUND_MSG:
-                self.basepoint = None
+                self._basepoint = None
             else:
                 raise e
 
@@ -101,6 +123,47 @@ class Hyperplane(object):
 
         return output
 
+    def canonical_form(self):
+        """
+        Coefficients and constant term scaled so the first nonzero
+        coefficient is one. The values are rounded to the decimal place of
+        the backend's near zero tolerance, so equations are only merged when
+        they differ by less than the tolerance, and kept exact with the
+        fraction backend. Duplicate and proportional equations get the same
+        tuple.
+        """
+        try:
+            return self._canonical_form
+        except AttributeError:
+            pass
+
+        convert = BACKEND_CONVERTERS[self.backend]
+        n = self.normal_vector
+        try:
+            factor = n[Hyperplane.first_nonzero_index(n)]
+        except Exception as e:
+            if str(e) == Hyperplane.NO_NONZERO_ELTS_FOUND_MSG:
+                factor = convert(1)
+            else:
+                raise e
+
+        values = [c / factor for c in n.coordinates]
+        values.append(self.constant_term / factor)
+        tolerance = NEAR_ZERO_TOLERANCES[self.backend]
+        if tolerance:
+            places = int(ceil(-log10(tolerance)))
+            values = [round(value, places) for value in values]
+
+        self._canonical_form = tuple(values)
+        return self._canonical_form
+
+    def __hash__(self):
+        """
+        Hash of the canonical form. Equations within the __eq__ tolerance of
+        each other can still straddle a rounding boundary and hash apart.
+        """
+        return hash(self.canonical_form())
+
     def is_parallel(self, plane2):
         return self.normal_vector.is_parallel(plane2.normal_vector)
 
@@ -110,7 +173,7 @@ class Hyperplane(object):
                 return False
 
             diff = self.constant_term - plane2.constant_term
-            return MyDecimal(diff).is_near_zero()
+            return is_near_zero(diff)
 
         elif plane2.normal_vector.is_zero():
             return False
@@ -142,6 +205,6 @@ class Hyperplane(object):
     @staticmethod
     def first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
+            if not is_near_zero(item):
                 return k
         raise Exception(Hyperplane.NO_NONZERO_ELTS_FOUND_MSG)
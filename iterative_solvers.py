@@ -0,0 +1,205 @@
+import numpy as np
+from vector import Vector
+
+JACOBI = 'jacobi'
+GAUSS_SEIDEL = 'gauss_seidel'
+CONJUGATE_GRADIENT = 'conjugate_gradient'
+GMRES = 'gmres'
+
+SYSTEM_MUST_BE_SQUARE_MSG = ('Iterative solvers need as many equations as '
+                             'variables')
+ZERO_ON_DIAGONAL_MSG = 'Jacobi and Gauss-Seidel need a nonzero diagonal'
+UNKNOWN_METHOD_MSG = 'Unknown iterative method, use one of: {}'
+
+
+class IterativeSolution(object):
+    """
+    Result of an iterative solve: the solution Vector, whether the relative
+    residual ||b - A x|| / ||b|| got below the tolerance, and that residual
+    after every iteration (residuals[0] is the one of the initial guess).
+    """
+
+    def __init__(self, solution, residuals, converged):
+        self.solution = solution
+        self.residuals = residuals
+        self.converged = converged
+        self.iterations = len(residuals) - 1
+
+    def __str__(self):
+        return '{} after {} iterations, residual {:.3e}{}'.format(
+            self.solution, self.iterations, self.residuals[-1],
+            '' if self.converged else ' (not converged)')
+
+
+def _relative_residual(A, b, x, b_norm):
+    return np.linalg.norm(b - np.dot(A, x)) / b_norm
+
+
+def jacobi(A, b, x, tolerance, max_iterations):
+    diagonal = np.diag(A)
+    if not diagonal.all():
+        raise Exception(ZERO_ON_DIAGONAL_MSG)
+    off_diagonal = A - np.diag(diagonal)
+    b_norm = np.linalg.norm(b) or 1.0
+
+    residuals = [_relative_residual(A, b, x, b_norm)]
+    while residuals[-1] > tolerance and len(residuals) <= max_iterations:
+        x = (b - np.dot(off_diagonal, x)) / diagonal
+        residuals.append(_relative_residual(A, b, x, b_norm))
+
+    return x, residuals
+
+
+def gauss_seidel(A, b, x, tolerance, max_iterations):
+    diagonal = np.diag(A)
+    if not diagonal.all():
+        raise Exception(ZERO_ON_DIAGONAL_MSG)
+    b_norm = np.linalg.norm(b) or 1.0
+    x = x.copy()
+
+    residuals = [_relative_residual(A, b, x, b_norm)]
+    while residuals[-1] > tolerance and len(residuals) <= max_iterations:
+        for i in range(len(b)):
+            x[i] += (b[i] - np.dot(A[i], x)) / diagonal[i]
+        residuals.append(_relative_residual(A, b, x, b_norm))
+
+    return x, residuals
+
+
+def conjugate_gradient(A, b, x, tolerance, max_iterations):
+    """
+    Conjugate gradient, for symmetric positive definite systems
+    """
+    b_norm = np.linalg.norm(b) or 1.0
+    r = b - np.dot(A, x)
+    p = r.copy()
+    r_squared = np.dot(r, r)
+
+    residuals = [np.sqrt(r_squared) / b_norm]
+    while residuals[-1] > tolerance and len(residuals) <= max_iterations:
+        Ap = np.dot(A, p)
+        alpha = r_squared / np.dot(p, Ap)
+        x = x + alpha * p
+        r = r - alpha * Ap
+        new_r_squared = np.dot(r, r)
+        p = r + (new_r_squared / r_squared) * p
+        r_squared = new_r_squared
+        residuals.append(np.sqrt(r_squared) / b_norm)
+
+    return x, residuals
+
+
+def gmres(A, b, x, tolerance, max_iterations, restart=None):
+    """
+    Restarted GMRES(restart) with Givens rotations, for general systems.
+    Every inner Arnoldi step counts as one iteration.
+    """
+    n = len(b)
+    restart = min(restart or n, n)
+    b_norm = np.linalg.norm(b) or 1.0
+
+    residuals = [_relative_residual(A, b, x, b_norm)]
+    while residuals[-1] > tolerance and len(residuals) <= max_iterations:
+        r = b - np.dot(A, x)
+        beta = np.linalg.norm(r)
+        basis = np.zeros((restart + 1, n))
+        hessenberg = np.zeros((restart + 1, restart))
+        cosines = np.zeros(restart)
+        sines = np.zeros(restart)
+        g = np.zeros(restart + 1)
+        g[0] = beta
+        basis[0] = r / beta
+
+        steps = 0
+        for j in range(restart):
+            w = np.dot(A, basis[j])
+            for i in range(j + 1):
+                hessenberg[i, j] = np.dot(w, basis[i])
+                w = w - hessenberg[i, j] * basis[i]
+            norm_w = np.linalg.norm(w)
+            hessenberg[j + 1, j] = norm_w
+
+            for i in range(j):
+                h_i, h_next = hessenberg[i, j], hessenberg[i + 1, j]
+                hessenberg[i, j] = cosines[i] * h_i + sines[i] * h_next
+                hessenberg[i + 1, j] = -sines[i] * h_i + cosines[i] * h_next
+
+            denominator = np.hypot(hessenberg[j, j], hessenberg[j + 1, j])
+            cosines[j] = hessenberg[j, j] / denominator
+            sines[j] = hessenberg[j + 1, j] / denominator
+            hessenberg[j, j] = denominator
+            hessenberg[j + 1, j] = 0.0
+            g[j + 1] = -sines[j] * g[j]
+            g[j] = cosines[j] * g[j]
+
+            steps = j + 1
+            residuals.append(abs(g[j + 1]) / b_norm)
+            if (residuals[-1] <= tolerance or not norm_w or
+                    len(residuals) > max_iterations):
+                break
+            basis[j + 1] = w / norm_w
+
+        y = np.linalg.solve(np.triu(hessenberg[:steps, :steps]), g[:steps])
+        x = x + np.dot(y, basis[:steps])
+        residuals[-1] = _relative_residual(A, b, x, b_norm)
+
+    return x, residuals
+
+
+METHODS = {
+    JACOBI: jacobi,
+    GAUSS_SEIDEL: gauss_seidel,
+    CONJUGATE_GRADIENT: conjugate_gradient,
+    GMRES: gmres,
+}
+
+
+def solve_iteratively(system, method=GMRES, initial_guess=None,
+                      tolerance=1e-10, max_iterations=1000, **options):
+    """
+    Solves a square system (a LinearSystem or list of planes) with one of
+    the iterative methods in METHODS, starting from `initial_guess` (zeros
+    by default) so a previous solution can be used as a warm start.
+    """
+    if method not in METHODS:
+        raise ValueError(UNKNOWN_METHOD_MSG.format(', '.join(sorted(METHODS))))
+
+    planes = list(system)
+    A = np.array([p.normal_vector.coordinates for p in planes], dtype=float)
+    b = np.array([p.constant_term for p in planes], dtype=float)
+    if A.shape[0] != A.shape[1]:
+        raise Exception(SYSTEM_MUST_BE_SQUARE_MSG)
+
+    if initial_guess is None:
+        x = np.zeros(len(b))
+    else:
+        x = np.array(list(initial_guess), dtype=float)
+
+    x, residuals = METHODS[method](A, b, x, tolerance, max_iterations,
+                                   **options)
+    residuals = [float(residual) for residual in residuals]
+    backend = planes[0].normal_vector.backend
+
+    return IterativeSolution(Vector(x.tolist(), backend), residuals,
+                             residuals[-1] <= tolerance)
+
+
+if __name__ == '__main__':
+    from hyperplane import Hyperplane
+
+    # symmetric positive definite and diagonally dominant, so every method
+    # converges
+    planes = [Hyperplane(normal_vector=Vector([4, 1, 0]), constant_term=1),
+              Hyperplane(normal_vector=Vector([1, 3, 1]), constant_term=2),
+              Hyperplane(normal_vector=Vector([0, 1, 2]), constant_term=3)]
+
+    for method in sorted(METHODS):
+        result = solve_iteratively(planes, method)
+        print('{}: {}'.format(method, result))
+
+    result = solve_iteratively(planes, GMRES, restart=2)
+    print('restarted gmres: {}'.format(result))
+
+    warm_start = solve_iteratively(planes, GMRES,
+                                   initial_guess=result.solution)
+    print('warm started gmres: {}'.format(warm_start))
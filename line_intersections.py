@@ -0,0 +1,136 @@
+import numpy as np
+from batch_solvers import INF_SOLUTIONS, NO_SOLUTIONS, UNIQUE_SOLUTION
+from vector import NEAR_ZERO_TOLERANCES, get_backend
+
+# Status codes of a pair of lines, same values as the batch solvers use
+INTERSECTING = UNIQUE_SOLUTION
+PARALLEL = NO_SOLUTIONS
+COINCIDENT = INF_SOLUTIONS
+
+DEFAULT_PAIR_CHUNK_SIZE = 1 << 22
+
+LINES_MUST_BE_2D_MSG = ('Lines must be given as Line objects or as an L x 3 '
+                        'array of [a, b, k] rows for ax + by = k')
+
+
+def as_line_arrays(lines):
+    """
+    Returns the L x 2 normal vectors and the L constant terms of `lines`,
+    which is a list of Line objects or an L x 3 array of [a, b, k] rows
+    """
+    if not isinstance(lines, np.ndarray):
+        lines = [list(line.normal_vector.coordinates) + [line.constant_term]
+                 if hasattr(line, 'normal_vector') else line
+                 for line in lines]
+
+    lines = np.asarray(lines, dtype=float)
+    if lines.ndim != 2 or lines.shape[1] != 3:
+        raise Exception(LINES_MUST_BE_2D_MSG)
+
+    return lines[:, :2], lines[:, 2]
+
+
+def iter_all_pairs_intersections(lines, bounding_box=None,
+                                 include_parallel=True,
+                                 chunk_size=DEFAULT_PAIR_CHUNK_SIZE,
+                                 eps=None):
+    """
+    Intersects every pair of lines i < j, evaluating at most about
+    `chunk_size` pairs at a time with the same closed form as
+    Line.intersection.
+
+    Yields (pairs, points, status) per chunk: a K x 2 array of line indices,
+    a K x 2 array of intersection points (nan unless the lines intersect)
+    and an array of INTERSECTING, PARALLEL or COINCIDENT codes. With a
+    `bounding_box` (xmin, ymin, xmax, ymax), only the intersection points
+    inside it are kept. Parallel and coincident pairs are kept unless
+    include_parallel is False.
+    """
+    if eps is None:
+        eps = NEAR_ZERO_TOLERANCES[get_backend()]
+
+    normals, constant_terms = as_line_arrays(lines)
+    num_lines = len(constant_terms)
+    rows_per_chunk = max(1, chunk_size // max(num_lines, 1))
+
+    for start in range(0, num_lines - 1, rows_per_chunk):
+        stop = min(start + rows_per_chunk, num_lines - 1)
+        rows = np.arange(start, stop)[:, None]
+        cols = np.arange(start + 1, num_lines)[None, :]
+
+        # Every quantity below is a block of rows start:stop against the
+        # lines after start, only its entries with row < col are pairs
+        a, b, k1 = (normals[start:stop, 0:1], normals[start:stop, 1:2],
+                    constant_terms[start:stop, None])
+        c, d, k2 = (normals[start + 1:, 0], normals[start + 1:, 1],
+                    constant_terms[start + 1:])
+        denominators = a * d - b * c
+        intersecting = np.abs(denominators) >= eps
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = (d * k1 - b * k2) / denominators
+            y = (-c * k1 + a * k2) / denominators
+
+        keep = intersecting
+        if bounding_box is not None:
+            xmin, ymin, xmax, ymax = bounding_box
+            with np.errstate(invalid='ignore'):
+                keep = keep & ((x >= xmin) & (x <= xmax) &
+                               (y >= ymin) & (y <= ymax))
+        if include_parallel:
+            keep = keep | ~intersecting
+        keep &= rows < cols
+
+        i, j = np.nonzero(keep)
+        intersecting = intersecting[i, j]
+        points = np.full((len(i), 2), np.nan)
+        points[intersecting, 0] = x[i, j][intersecting]
+        points[intersecting, 1] = y[i, j][intersecting]
+
+        # Parallel lines are the same line when [a, b, k] rows are proportional
+        a, b, k1 = a[i, 0], b[i, 0], k1[i, 0]
+        c, d, k2 = c[j], d[j], k2[j]
+        coincident = (~intersecting &
+                      (np.abs(a * k2 - c * k1) < eps) &
+                      (np.abs(b * k2 - d * k1) < eps))
+        status = np.full(len(i), PARALLEL, dtype=np.int8)
+        status[intersecting] = INTERSECTING
+        status[coincident] = COINCIDENT
+
+        yield np.stack([i + start, j + start + 1], axis=1), points, status
+
+
+def all_pairs_intersections(lines, bounding_box=None, include_parallel=True,
+                            chunk_size=DEFAULT_PAIR_CHUNK_SIZE, eps=None):
+    """
+    Returns (pairs, points, status) for every pair of lines at once, see
+    iter_all_pairs_intersections
+    """
+    chunks = list(iter_all_pairs_intersections(lines, bounding_box,
+                                               include_parallel, chunk_size,
+                                               eps))
+    if not chunks:
+        return (np.zeros((0, 2), dtype=int), np.zeros((0, 2)),
+                np.zeros(0, dtype=np.int8))
+
+    pairs, points, status = zip(*chunks)
+    return (np.concatenate(pairs), np.concatenate(points),
+            np.concatenate(status))
+
+
+if __name__ == '__main__':
+    # lines of the three systems from the course, plus one parallel copy
+    lines = [[4.046, 2.836, 1.21], [10.115, 7.09, 3.025],
+             [7.204, 3.182, 8.68], [8.172, 4.114, 9.883],
+             [1.182, 5.562, 6.744], [1.773, 8.343, 9.525],
+             [4.046, 2.836, 5]]
+
+    pairs, points, status = all_pairs_intersections(lines, chunk_size=8)
+    print('pairs: {}'.format(pairs.tolist()))
+    print('points: {}'.format(np.round(points, 3).tolist()))
+    print('status: {}'.format(status.tolist()))
+
+    pairs, points, status = all_pairs_intersections(
+        lines, bounding_box=(-10, -10, 10, 10), include_parallel=False)
+    print('pairs inside the box: {}'.format(pairs.tolist()))
+    print('points inside the box: {}'.format(np.round(points, 3).tolist()))
@@ -1,15 +1,17 @@
-from copy import deepcopy
 from decimal import Decimal, getcontext
+from fractions import Fraction
 from hyperplane import Hyperplane
 from plane import Plane
-from vector import Vector
-
-getcontext().prec = 30
+from vector import (BACKEND_CONVERTERS, DECIMAL_BACKEND, FLOAT_BACKEND,
+                    FRACTION_BACKEND, Vector, get_backend, is_near_zero,
+                    set_backend)
 
+try:
+    from math import gcd
+except ImportError:
+    from fractions import gcd
 
-class MyDecimal(Decimal):
-    def is_near_zero(self, eps=1e-10):
-        return abs(self) < eps
+getcontext().prec = 30
 
 
 def _get_new_plane(coefficient, plane):
@@ -18,21 +20,386 @@ def _get_new_plane(coefficient, plane):
                       constant_term=coefficient * plane.constant_term)
 
 
+def _integer_rows(planes):
+    """
+    Converts every [normal vector | constant term] row to exact fractions
+    and scales it by the lcm of its denominators, so all entries are ints
+    """
+    rows = []
+    for p in planes:
+        values = [Fraction(c) for c in p.normal_vector.coordinates]
+        values.append(Fraction(p.constant_term))
+
+        multiple = 1
+        for value in values:
+            multiple = multiple * value.denominator // gcd(multiple,
+                                                           value.denominator)
+        rows.append([int(value * multiple) for value in values])
+
+    return rows
+
+
+def _bareiss_echelon(rows, num_variables):
+    """
+    Fraction-free (Bareiss) elimination of integer rows to row echelon form,
+    in place. Every division is exact, and the entries stay bounded by
+    minors of the input instead of growing like products of them.
+    Returns the pivot columns, one per nonzero row.
+    """
+    num_equations = len(rows)
+    previous_pivot = 1
+    pivot_columns = []
+
+    row = 0
+    for col in range(num_variables):
+        if row >= num_equations:
+            break
+
+        for k in range(row, num_equations):
+            if rows[k][col]:
+                rows[row], rows[k] = rows[k], rows[row]
+                break
+        else:
+            continue
+
+        pivot_values = rows[row]
+        pivot = pivot_values[col]
+        for i in range(row + 1, num_equations):
+            values = rows[i]
+            gamma = values[col]
+            for j in range(col + 1, num_variables + 1):
+                values[j] = ((pivot * values[j] - gamma * pivot_values[j]) //
+                             previous_pivot)
+            values[col] = 0
+
+        previous_pivot = pivot
+        pivot_columns.append(col)
+        row += 1
+
+    return pivot_columns
+
+
+def _exact_back_substitution(rows, pivot_columns, num_variables,
+                             free_values, homogeneous):
+    solution = [Fraction(0)] * num_variables
+    for free_var, value in free_values.items():
+        solution[free_var] = Fraction(value)
+
+    for k in range(len(pivot_columns))[::-1]:
+        col = pivot_columns[k]
+        values = rows[k]
+        total = Fraction(0) if homogeneous else Fraction(values[-1])
+        for j in range(col + 1, num_variables):
+            if values[j]:
+                total -= values[j] * solution[j]
+        solution[col] = total / values[col]
+
+    return solution
+
+
+class PivotInfo(object):
+    """
+    Pivot structure of a system in row echelon form: the pivot column of
+    each row (-1 for rows without nonzero coefficients), the free variables
+    and the rows that read 0 = c. Elimination records it while it runs, so
+    solving does not have to rescan the rows afterwards.
+
+    is_complete is False when elimination stopped at the first
+    contradiction. Then only contradictory_rows is reliable, and rank is a
+    lower bound.
+    """
+
+    def __init__(self, pivot_indices, num_variables, contradictory_rows,
+                 is_complete=True):
+        self.pivot_indices = pivot_indices
+        self.pivot_columns = [i for i in pivot_indices if i >= 0]
+        self.rank = len(self.pivot_columns)
+        self.zero_rows = [k for k, i in enumerate(pivot_indices) if i < 0]
+        self.free_variables = sorted(set(range(num_variables)) -
+                                     set(self.pivot_columns))
+        self.contradictory_rows = contradictory_rows
+        self.is_complete = is_complete
+
+    def is_consistent(self):
+        return not self.contradictory_rows
+
+
+class AugmentedMatrix(object):
+    """
+    Elimination engine working on one [normal vector | constant term] row
+    buffer per equation. Row operations mutate the rows in place, and
+    Hyperplane objects are only built once, by to_system, at the end.
+
+    Performs exactly the same arithmetic as the LinearSystem row operations,
+    so the results match theirs.
+    """
+
+    def __init__(self, system):
+        self.backend = system.backend
+        self.dimension = system.dimension
+        self.convert = BACKEND_CONVERTERS[self.backend]
+        self.rows = [list(p.normal_vector.coordinates) + [p.constant_term]
+                     for p in system.planes]
+        self.pivot_info = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def to_planes(self):
+        return [Hyperplane(normal_vector=Vector(row[:-1], self.backend),
+                           constant_term=row[-1])
+                for row in self.rows]
+
+    def to_system(self, system=None):
+        """
+        Builds a new LinearSystem from the rows, or replaces the planes of
+        `system` with them when one is given
+        """
+        if system is None:
+            system = LinearSystem(self.to_planes())
+        else:
+            system.planes[:] = self.to_planes()
+            system.reduction = None
+
+        system.pivot_info = self.pivot_info
+        return system
+
+    def swap_rows(self, row1, row2):
+        self.rows[row1], self.rows[row2] = self.rows[row2], self.rows[row1]
+
+    def multiply_coefficient_and_row(self, coefficient, row):
+        coefficient = self.convert(coefficient)
+        values = self.rows[row]
+        for j, value in enumerate(values):
+            values[j] = coefficient * value
+
+    def add_multiple_times_row_to_row(self, coefficient, row_to_add,
+                                      row_to_be_added_to):
+        coefficient = self.convert(coefficient)
+        values = self.rows[row_to_be_added_to]
+        for j, value in enumerate(self.rows[row_to_add]):
+            values[j] = values[j] + coefficient * value
+
+    def indices_of_first_nonzero_terms_in_each_row(self):
+        indices = [-1] * len(self)
+
+        for i, values in enumerate(self.rows):
+            for j in range(self.dimension):
+                if not is_near_zero(values[j]):
+                    indices[i] = j
+                    break
+
+        return indices
+
+    def did_swap_with_row_below(self, row, col):
+        for k in range(row + 1, len(self)):
+            if not is_near_zero(self.rows[k][col]):
+                self.swap_rows(row, k)
+                return True
+
+        return False
+
+    def clear_coefficients_bellow(self, row, col):
+        beta = self.rows[row][col]
+
+        for row_to_be_added_to in range(row + 1, len(self)):
+            gamma = self.rows[row_to_be_added_to][col]
+            alpha = -gamma / beta
+            self.add_multiple_times_row_to_row(alpha, row, row_to_be_added_to)
+
+    def clear_coefficients_above(self, row, col):
+        for row_to_be_added_to in range(row)[::-1]:
+            alpha = -(self.rows[row_to_be_added_to][col])
+            self.add_multiple_times_row_to_row(alpha, row, row_to_be_added_to)
+
+    def scale_row_to_make_coefficient_equal_one(self, row, col):
+        beta = self.convert('1.0') / self.rows[row][col]
+        self.multiply_coefficient_and_row(beta, row)
+
+    def first_contradictory_row(self, start_row=0, start_col=0):
+        """
+        Index of the first row from `start_row` on that reads 0 = c, only
+        looking at the coefficients from `start_col` on, or -1 if none does
+        """
+        for k in range(start_row, len(self)):
+            values = self.rows[k]
+            for j in range(start_col, self.dimension):
+                if not is_near_zero(values[j]):
+                    break
+            else:
+                if not is_near_zero(values[-1]):
+                    return k
+
+        return -1
+
+    def compute_triangular_form(self, stop_on_contradiction=False):
+        """
+        Forward elimination, recording the PivotInfo of the result as it
+        goes. With stop_on_contradiction, it stops as soon as a 0 = c row
+        shows up below the pivots found so far.
+        """
+        num_equations = len(self)
+        num_variables = self.dimension
+        pivot_columns = []
+        contradictory_rows = []
+
+        col = 0
+        for row in range(num_equations):
+            while col < num_variables:
+                if is_near_zero(self.rows[row][col]):
+                    swap_succeeded = self.did_swap_with_row_below(row, col)
+                    if not swap_succeeded:
+                        col += 1
+                        continue
+
+                self.clear_coefficients_bellow(row, col)
+                pivot_columns.append(col)
+                col += 1
+                break
+            else:
+                break
+
+            if stop_on_contradiction:
+                k = self.first_contradictory_row(row + 1, col)
+                if k >= 0:
+                    contradictory_rows.append(k)
+                    break
+
+        rank = len(pivot_columns)
+        is_complete = not contradictory_rows
+        if is_complete:
+            # Every row below the pivots has only near zero coefficients
+            contradictory_rows = [k for k in range(rank, num_equations)
+                                  if not is_near_zero(self.rows[k][-1])]
+
+        pivot_indices = pivot_columns + [-1] * (num_equations - rank)
+        self.pivot_info = PivotInfo(pivot_indices, num_variables,
+                                    contradictory_rows, is_complete)
+        return self.pivot_info
+
+    def compute_rref(self):
+        """
+        Back substitution only touches the pivot rows, so the PivotInfo of
+        the triangular form also describes the rref
+        """
+        pivot_info = self.compute_triangular_form()
+
+        for row in range(pivot_info.rank)[::-1]:
+            pivot_var = pivot_info.pivot_columns[row]
+            self.scale_row_to_make_coefficient_equal_one(row, pivot_var)
+            self.clear_coefficients_above(row, pivot_var)
+
+        return pivot_info
+
+
+class IncrementalReduction(object):
+    """
+    Reduced row-echelon form of a system that is kept up to date as
+    equations are added.
+
+    Only the pivot rows are stored, normalized so their pivot is one and
+    cleared from every other row. add_row reduces the new equation against
+    the existing pivots and, if a new pivot appears, clears it from the
+    other rows, which is O(rank * dimension). Rank, consistency and the
+    Parametrization of the solution are read directly from the rows.
+    """
+
+    def __init__(self, dimension, backend):
+        self.dimension = dimension
+        self.backend = backend
+        self.convert = BACKEND_CONVERTERS[backend]
+        self.rows = []
+        self.pivot_columns = []
+        self.num_contradictory_equations = 0
+
+    @property
+    def rank(self):
+        return len(self.rows)
+
+    def is_consistent(self):
+        return not self.num_contradictory_equations
+
+    def add_row(self, plane):
+        values = [self.convert(c) for c in plane.normal_vector.coordinates]
+        values.append(self.convert(plane.constant_term))
+
+        for pivot_var, pivot_values in zip(self.pivot_columns, self.rows):
+            alpha = values[pivot_var]
+            if alpha:
+                values = [x - alpha * y for x, y in zip(values, pivot_values)]
+
+        for col in range(self.dimension):
+            if not is_near_zero(values[col]):
+                break
+        else:
+            if not is_near_zero(values[-1]):
+                self.num_contradictory_equations += 1
+            return
+
+        beta = self.convert('1.0') / values[col]
+        values = [beta * value for value in values]
+
+        for k, pivot_values in enumerate(self.rows):
+            alpha = pivot_values[col]
+            if alpha:
+                self.rows[k] = [x - alpha * y
+                                for x, y in zip(pivot_values, values)]
+
+        position = sum(1 for pivot_var in self.pivot_columns
+                       if pivot_var < col)
+        self.rows.insert(position, values)
+        self.pivot_columns.insert(position, col)
+
+    def compute_solution(self):
+        if not self.is_consistent():
+            return LinearSystem.NO_SOLUTIONS_MSG
+
+        num_variables = self.dimension
+        free_variable_indices = sorted(set(range(num_variables)) -
+                                       set(self.pivot_columns))
+
+        direction_vectors = []
+        for free_var in free_variable_indices:
+            vector_coords = [0] * num_variables
+            vector_coords[free_var] = 1
+            for pivot_var, values in zip(self.pivot_columns, self.rows):
+                vector_coords[pivot_var] = -values[free_var]
+            direction_vectors.append(Vector(vector_coords, self.backend))
+
+        basepoint_coords = [0] * num_variables
+        for pivot_var, values in zip(self.pivot_columns, self.rows):
+            basepoint_coords[pivot_var] = values[-1]
+
+        return Parametrization(Vector(basepoint_coords, self.backend),
+                               direction_vectors)
+
+
 class LinearSystem(object):
 
     ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG = ('All planes in the system should '
                                           'live in the same dimension')
     NO_SOLUTIONS_MSG = 'No solutions'
     INF_SOLUTIONS_MSG = 'Infinitely many solutions'
+    UNIQUE_SOLUTION_MSG = 'Unique solution'
 
-    def __init__(self, planes):
+    def __init__(self, planes, backend=None):
         try:
             d = planes[0].dimension
             for p in planes:
                 assert p.dimension == d
 
+            if backend:
+                planes = [p if p.backend == backend else
+                          Hyperplane(normal_vector=p.normal_vector,
+                                     constant_term=p.constant_term,
+                                     backend=backend)
+                          for p in planes]
+
             self.planes = planes
             self.dimension = d
+            self.backend = planes[0].backend
+            self.reduction = None
+            self.pivot_info = None
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
@@ -47,6 +414,8 @@ class LinearSystem(object):
         try:
             assert x.dimension == self.dimension
             self.planes[i] = x
+            self.reduction = None
+            self.pivot_info = None
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
@@ -58,6 +427,96 @@ class LinearSystem(object):
         ret += '\n'.join(temp)
         return ret
 
+    def append(self, plane):
+        """
+        Adds an equation. If the reduced form is being tracked, only the new
+        equation is reduced against it.
+        """
+        if plane.dimension != self.dimension:
+            raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+        self.planes.append(plane)
+        self.pivot_info = None
+        if self.reduction is not None:
+            self.reduction.add_row(plane)
+
+    def remove(self, i):
+        """
+        Removes equation i. The tracked reduced form is rebuilt from the
+        remaining equations the next time it is needed.
+        """
+        del self.planes[i]
+        self.reduction = None
+        self.pivot_info = None
+
+    def get_reduction(self):
+        """
+        Returns the IncrementalReduction of the system, building it on first
+        use and keeping it up to date on every later append
+        """
+        if self.reduction is None:
+            self.reduction = IncrementalReduction(self.dimension,
+                                                  self.backend)
+            for plane in self.planes:
+                self.reduction.add_row(plane)
+        return self.reduction
+
+    def _rank_and_consistency(self, stop_on_contradiction):
+        if self.reduction is not None:
+            return self.reduction.rank, self.reduction.is_consistent()
+
+        pivot_info = AugmentedMatrix(self).compute_triangular_form(
+            stop_on_contradiction)
+        return pivot_info.rank, pivot_info.is_consistent()
+
+    def rank(self):
+        """
+        Rank of the coefficient matrix, from forward elimination only
+        """
+        return self._rank_and_consistency(False)[0]
+
+    def is_consistent(self):
+        """
+        Whether the system has at least one solution. Elimination stops as
+        soon as a 0 = c equation appears.
+        """
+        return self._rank_and_consistency(True)[1]
+
+    def solution_kind(self):
+        """
+        Returns NO_SOLUTIONS_MSG, INF_SOLUTIONS_MSG or UNIQUE_SOLUTION_MSG
+        without computing the rref or the parametrization
+        """
+        rank, is_consistent = self._rank_and_consistency(True)
+        if not is_consistent:
+            return self.NO_SOLUTIONS_MSG
+        if rank < self.dimension:
+            return self.INF_SOLUTIONS_MSG
+        return self.UNIQUE_SOLUTION_MSG
+
+    def remove_duplicate_equations(self, inplace=False):
+        """
+        Drops every equation with the same canonical form as an earlier one,
+        which covers exact duplicates and scalar multiples, using one hash
+        lookup per equation. Returns the reduced system as a new one, or
+        rewrites this system when inplace is True.
+        """
+        seen = set()
+        planes = []
+        for plane in self.planes:
+            key = plane.canonical_form()
+            if key not in seen:
+                seen.add(key)
+                planes.append(plane)
+
+        if not inplace:
+            return LinearSystem(planes)
+
+        self.planes[:] = planes
+        self.reduction = None
+        self.pivot_info = None
+        return self
+
     def swap_rows(self, row1, row2):
         self[row1], self[row2] = self[row2], self[row1]
 
@@ -80,45 +539,44 @@ class LinearSystem(object):
         indices = [-1] * num_equations
 
         for i, p in enumerate(self.planes):
-            try:
-                p.first_nonzero_index(p.normal_vector)
-                indices[i] = p.first_nonzero_index(p.normal_vector)
-            except Exception as e:
-                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                    continue
-                else:
-                    raise e
+            for j, coefficient in enumerate(p.normal_vector):
+                if not is_near_zero(coefficient):
+                    indices[i] = j
+                    break
 
         return indices
 
-    def compute_triangular_form(self):
-        system = deepcopy(self)
-
-        num_equations = len(system)
-        num_variables = system.dimension
-
-        col = 0
-        for row in range(num_equations):
-            while col < num_variables:
-                c = MyDecimal(system[row].normal_vector[col])
-                if c.is_near_zero():
-                    swap_succeeded = system.did_swap_with_row_below(row, col)
-                    if not swap_succeeded:
-                        col += 1
-                        continue
-
-                system.clear_coefficients_bellow(row, col)
-                col += 1
-                break
-
-        return system
+    def get_pivot_info(self):
+        """
+        PivotInfo of the system. Systems returned by compute_triangular_form
+        and compute_rref carry the one recorded during elimination, for any
+        other system it is computed with a single scan of the rows.
+        """
+        if self.pivot_info is None:
+            pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
+            contradictory_rows = [
+                k for k, pivot_var in enumerate(pivot_indices)
+                if pivot_var < 0 and
+                not is_near_zero(self.planes[k].constant_term)]
+            self.pivot_info = PivotInfo(pivot_indices, self.dimension,
+                                        contradictory_rows)
+        return self.pivot_info
+
+    def compute_triangular_form(self, inplace=False):
+        """
+        Returns the triangular form as a new system, leaving this one
+        untouched, or rewrites this system's planes when inplace is True
+        """
+        matrix = AugmentedMatrix(self)
+        matrix.compute_triangular_form()
+        return matrix.to_system(self if inplace else None)
 
     def did_swap_with_row_below(self, row, col):
         num_equations = len(self)
 
         for k in range(row + 1, num_equations):
-            coefficient = MyDecimal(self[k].normal_vector[col])
-            if not coefficient.is_near_zero():
+            coefficient = self[k].normal_vector[col]
+            if not is_near_zero(coefficient):
                 self.swap_rows(row, k)
                 return True
 
@@ -126,7 +584,7 @@ class LinearSystem(object):
 
     def clear_coefficients_bellow(self, row, col):
         num_equations = len(self)
-        beta = MyDecimal(self[row].normal_vector[col])
+        beta = self[row].normal_vector[col]
 
         for row_to_be_added_to in range(row + 1, num_equations):
             n = self[row_to_be_added_to].normal_vector
@@ -140,24 +598,14 @@ class LinearSystem(object):
             alpha = -(n[col])
             self.add_multiple_times_row_to_row(alpha, row, row_to_be_added_to)
 
-    def compute_rref(self):
-        tf = self.compute_triangular_form()
-
-        num_equations = len(tf)
-        pivot_indices = tf.indices_of_first_nonzero_terms_in_each_row()
-
-        for row in range(num_equations)[::-1]:
-            pivot_var = pivot_indices[row]
-            if pivot_var < 0:
-                continue
-            tf.scale_row_to_make_coefficient_equal_one(row, pivot_var)
-            tf.clear_coefficients_above(row, pivot_var)
-
-        return tf
+    def compute_rref(self, inplace=False):
+        matrix = AugmentedMatrix(self)
+        matrix.compute_rref()
+        return matrix.to_system(self if inplace else None)
 
     def scale_row_to_make_coefficient_equal_one(self, row, col):
         n = self[row].normal_vector
-        beta = Decimal('1.0') / n[col]
+        beta = BACKEND_CONVERTERS[self.backend]('1.0') / n[col]
         self.multiply_coefficient_and_row(beta, row)
 
     def do_gaussian_elimination(self):
@@ -173,33 +621,143 @@ class LinearSystem(object):
         solution_coordinates = [rref.planes[i].constant_term
                                 for i in range(num_variables)]
 
-        return Vector(solution_coordinates)
+        return Vector(solution_coordinates, self.backend)
 
     def raise_excepion_if_contradictory_equation(self):
-        for plane in self.planes:
-            try:
-                plane.first_nonzero_index(plane.normal_vector)
-
-            except Exception as e:
-                if str(e) == 'No nonzero elements found':
-                    constant_term = MyDecimal(plane.constant_term)
-                    if not constant_term.is_near_zero():
-                        raise Exception(self.NO_SOLUTIONS_MSG)
-
-                else:
-                    raise e
+        if not self.get_pivot_info().is_consistent():
+            raise Exception(self.NO_SOLUTIONS_MSG)
 
     def raise_excepion_if_too_few_pivots(self):
-        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
-        num_pivots = sum([1 if index >= 0 else 0 for index in pivot_indices])
+        if self.get_pivot_info().rank < self.dimension:
+            raise Exception(self.INF_SOLUTIONS_MSG)
+
+    def exact_rank(self):
+        """
+        Rank of the coefficient matrix, computed exactly with Bareiss
+        elimination on the rational values of the coefficients
+        """
+        rows = _integer_rows(self.planes)
+        return len(_bareiss_echelon(rows, self.dimension))
+
+    def compute_exact_solution(self):
+        """
+        Exact counterpart of compute_solution for integer or rational
+        systems. Uses Bareiss fraction-free elimination, so pivots are
+        decided without any tolerance, and returns a Parametrization of
+        fractions.Fraction vectors or the no solutions message.
+        """
         num_variables = self.dimension
+        rows = _integer_rows(self.planes)
+        pivot_columns = _bareiss_echelon(rows, num_variables)
+
+        for values in rows[len(pivot_columns):]:
+            if values[-1]:
+                return self.NO_SOLUTIONS_MSG
+
+        free_variable_indices = sorted(set(range(num_variables)) -
+                                       set(pivot_columns))
+
+        basepoint = _exact_back_substitution(rows, pivot_columns,
+                                             num_variables, {}, False)
+        direction_vectors = [
+            Vector(_exact_back_substitution(rows, pivot_columns,
+                                            num_variables, {free_var: 1},
+                                            True),
+                   FRACTION_BACKEND)
+            for free_var in free_variable_indices]
+
+        return Parametrization(Vector(basepoint, FRACTION_BACKEND),
+                               direction_vectors)
+
+    def factorize(self):
+        return LUFactorization(self)
+
+    def compute_iterative_solution(self, method='gmres', initial_guess=None,
+                                   tolerance=1e-10, max_iterations=1000,
+                                   **options):
+        """
+        Solves a square system with Jacobi, Gauss-Seidel, conjugate gradient
+        or GMRES, see iterative_solvers.solve_iteratively
+        """
+        from iterative_solvers import solve_iteratively
+        return solve_iteratively(self.planes, method, initial_guess,
+                                 tolerance, max_iterations, **options)
+
+    def compute_refined_solution(self, tolerance=1e-20, max_steps=10):
+        """
+        Mixed-precision solve for square systems with a unique solution. The
+        LU factorization and every correction solve run in float64, while
+        the residuals b - A x are computed in Decimal, until the relative
+        residual is below `tolerance` or `max_steps` refinements were done.
+
+        Returns a RefinedSolution that also reports the achieved residual
+        and the number of refinement steps. Its basepoint is a Decimal
+        vector whatever the backend of the system, since float could not
+        hold the digits the refinement gains. Other systems fall back to
+        compute_solution.
+        """
+        num_variables = self.dimension
+        lu = LinearSystem(self.planes, backend=FLOAT_BACKEND).factorize()
+        if len(self) != num_variables or lu.rank < num_variables:
+            return self.compute_solution()
+
+        coefficients = [[Decimal(c) for c in p.normal_vector.coordinates]
+                        for p in self.planes]
+        constant_terms = [Decimal(p.constant_term) for p in self.planes]
+        scale = max(abs(c) for c in constant_terms) or Decimal(1)
+
+        solution = [Decimal(x) for x in lu.solve(constant_terms).basepoint]
+        steps = 0
+        while True:
+            residuals = [c - sum(a * x for a, x in zip(row, solution))
+                         for row, c in zip(coefficients, constant_terms)]
+            residual = max(abs(r) for r in residuals) / scale
+            if residual <= tolerance or steps >= max_steps:
+                break
 
-        if num_pivots < num_variables:
-            raise Exception(self.INF_SOLUTIONS_MSG)
+            correction = lu.solve(residuals).basepoint
+            solution = [x + Decimal(d) for x, d in zip(solution, correction)]
+            steps += 1
+
+        return RefinedSolution(Vector(solution, DECIMAL_BACKEND), residual,
+                               steps)
+
+    def compute_blocked_solution(self, block_size=128, workers=None):
+        """
+        Solves large dense square systems with blocked LU in float64, with
+        the trailing updates spread over `workers` threads. Systems without
+        a unique solution fall back to compute_solution.
+        """
+        import blocked_elimination
+
+        if len(self) != self.dimension:
+            return self.compute_solution()
+
+        try:
+            x = blocked_elimination.solve_blocked(self.planes, block_size,
+                                                  workers)
+        except Exception as e:
+            if str(e) == blocked_elimination.SINGULAR_SYSTEM_MSG:
+                return self.compute_solution()
+            raise e
+
+        return Parametrization(Vector(x.tolist(), self.backend), [])
+
+    def to_sparse(self):
+        from sparse_linear_system import SparseLinearSystem
+        return SparseLinearSystem.from_planes(self.planes)
+
+    def compute_solution(self, remove_duplicates=False):
+        """
+        With remove_duplicates, duplicate and proportional equations are
+        dropped before elimination starts, see remove_duplicate_equations
+        """
+        system = self
+        if remove_duplicates:
+            system = self.remove_duplicate_equations()
 
-    def compute_solution(self):
         try:
-            return self.do_gaussian_elimination_and_parametrization()
+            return system.do_gaussian_elimination_and_parametrization()
 
         except Exception as e:
             if str(e) == self.NO_SOLUTIONS_MSG:
@@ -218,8 +776,8 @@ class LinearSystem(object):
 
     def extract_direction_vectors_for_parametrization(self):
         num_variables = self.dimension
-        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
-        free_variable_indices = set(range(num_variables)) - set(pivot_indices)
+        pivot_indices = self.get_pivot_info().pivot_indices
+        free_variable_indices = self.get_pivot_info().free_variables
 
         direction_vectors = []
 
@@ -232,13 +790,13 @@ class LinearSystem(object):
                     break
                 vector_coords[pivot_var] = -plane.normal_vector[free_var]
 
-            direction_vectors.append(Vector(vector_coords))
+            direction_vectors.append(Vector(vector_coords, self.backend))
 
         return direction_vectors
 
     def extract_basepoint_for_parametrization(self):
         num_variables = self.dimension
-        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
+        pivot_indices = self.get_pivot_info().pivot_indices
 
         basepoint_coords = [0] * num_variables
 
@@ -248,9 +806,14 @@ class LinearSystem(object):
                 break
             basepoint_coords[pivot_var] = plane.constant_term
 
-        return Vector(basepoint_coords)
+        return Vector(basepoint_coords, self.backend)
 
 
+# The demos and checks below are written for the decimal backend, the
+# caller's default backend is restored at the end of the module
+caller_backend = get_backend()
+set_backend(DECIMAL_BACKEND)
+
 p0 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
 p1 = Plane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
 p2 = Plane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
@@ -468,6 +1031,164 @@ class Parametrization(object):
         return output
 
 
+class RefinedSolution(Parametrization):
+    """
+    Unique solution found by LinearSystem.compute_refined_solution, with the
+    relative residual it reached and the refinement steps it took
+    """
+
+    def __init__(self, basepoint, residual, refinement_steps):
+        super(RefinedSolution, self).__init__(basepoint, [])
+        self.residual = residual
+        self.refinement_steps = refinement_steps
+
+
+class LUFactorization(object):
+    """
+    LU factorization with partial pivoting of the normal vectors of a
+    system, P A = L U, with U in row echelon form.
+
+    The O(n^3) work, including reducing U to rref and extracting the
+    direction vectors of the parametrization, is paid once at construction.
+    solve then handles each new vector of constant terms in O(n^2) and
+    returns the same result compute_solution would for that system.
+    """
+
+    CONSTANT_TERMS_MUST_MATCH_NUM_EQUATIONS_MSG = (
+        'There must be one constant term per equation')
+
+    def __init__(self, system):
+        self.backend = system.backend
+        self.dimension = system.dimension
+        self.num_equations = len(system)
+        convert = BACKEND_CONVERTERS[self.backend]
+        zero = convert(0)
+
+        num_equations = self.num_equations
+        num_variables = self.dimension
+        upper = [list(p.normal_vector.coordinates) for p in system.planes]
+        lower = [[zero] * num_equations for _ in range(num_equations)]
+        permutation = list(range(num_equations))
+        pivot_columns = []
+
+        row = 0
+        for col in range(num_variables):
+            if row >= num_equations:
+                break
+
+            pivot_row = max(range(row, num_equations),
+                            key=lambda k: abs(upper[k][col]))
+            if is_near_zero(upper[pivot_row][col]):
+                continue
+
+            upper[row], upper[pivot_row] = upper[pivot_row], upper[row]
+            lower[row], lower[pivot_row] = lower[pivot_row], lower[row]
+            permutation[row], permutation[pivot_row] = \
+                permutation[pivot_row], permutation[row]
+
+            pivot = upper[row][col]
+            for i in range(row + 1, num_equations):
+                factor = upper[i][col] / pivot
+                lower[i][row] = factor
+                upper[i][col] = zero
+                for j in range(col + 1, num_variables):
+                    upper[i][j] = upper[i][j] - factor * upper[row][j]
+
+            pivot_columns.append(col)
+            row += 1
+
+        self.lower = lower
+        self.upper = upper
+        self.permutation = permutation
+        self.pivot_columns = pivot_columns
+        self.rank = len(pivot_columns)
+
+        self._reduce_upper(convert)
+        self.direction_vectors = self._extract_direction_vectors()
+
+    def _reduce_upper(self, convert):
+        """
+        Brings the pivot rows of U to rref, R = E U, and keeps the r x r
+        transformation E to apply it to the constant terms later
+        """
+        rank = self.rank
+        reduced = [list(values) for values in self.upper[:rank]]
+        transformation = [[convert(1) if i == j else convert(0)
+                           for j in range(rank)] for i in range(rank)]
+
+        for k in range(rank)[::-1]:
+            col = self.pivot_columns[k]
+            beta = convert('1.0') / reduced[k][col]
+            reduced[k] = [beta * value for value in reduced[k]]
+            transformation[k] = [beta * value for value in transformation[k]]
+
+            for i in range(k):
+                alpha = reduced[i][col]
+                reduced[i] = [x - alpha * y
+                              for x, y in zip(reduced[i], reduced[k])]
+                transformation[i] = [x - alpha * y for x, y in
+                                     zip(transformation[i], transformation[k])]
+
+        self.reduced = reduced
+        self.transformation = transformation
+
+    def _extract_direction_vectors(self):
+        num_variables = self.dimension
+        free_variable_indices = (set(range(num_variables)) -
+                                 set(self.pivot_columns))
+
+        direction_vectors = []
+
+        for free_var in sorted(free_variable_indices):
+            vector_coords = [0] * num_variables
+            vector_coords[free_var] = 1
+            for k, pivot_var in enumerate(self.pivot_columns):
+                vector_coords[pivot_var] = -self.reduced[k][free_var]
+
+            direction_vectors.append(Vector(vector_coords, self.backend))
+
+        return direction_vectors
+
+    def solve(self, constant_terms):
+        """
+        Solves the factorized system for one vector of constant terms. Like
+        compute_solution, returns a Parametrization or the no solutions
+        message.
+        """
+        if len(constant_terms) != self.num_equations:
+            raise Exception(self.CONSTANT_TERMS_MUST_MATCH_NUM_EQUATIONS_MSG)
+
+        convert = BACKEND_CONVERTERS[self.backend]
+        permuted = [convert(constant_terms[i]) for i in self.permutation]
+
+        forward = []
+        for i, value in enumerate(permuted):
+            for j in range(i):
+                value = value - self.lower[i][j] * forward[j]
+            forward.append(value)
+
+        for value in forward[self.rank:]:
+            if not is_near_zero(value):
+                return LinearSystem.NO_SOLUTIONS_MSG
+
+        basepoint_coords = [0] * self.dimension
+        for k, pivot_var in enumerate(self.pivot_columns):
+            basepoint_coords[pivot_var] = sum(
+                x * y for x, y in zip(self.transformation[k][k:],
+                                      forward[k:self.rank]))
+
+        return Parametrization(Vector(basepoint_coords, self.backend),
+                               self.direction_vectors)
+
+    def solve_many(self, constant_terms_list):
+        """
+        Solves every vector of constant terms in `constant_terms_list`,
+        e.g. the rows of a matrix of right-hand sides
+        """
+        return [self.solve(constant_terms)
+                for constant_terms in constant_terms_list]
+
+
 p1 = Plane(normal_vector=Vector([0.786, 0.786, 0.588]), constant_term=-0.714)
 p2 = Plane(normal_vector=Vector([-0.131, -0.131, 0.244]), constant_term=0.319)
 
@@ -518,3 +1239,280 @@ p3 = Hyperplane(normal_vector=Vector([9.015, -5.873, -1.105, 2.013, -2.802]),
 
 system = LinearSystem([p1, p2, p3])
 print system.compute_solution()
+
+
+# ***************
+
+p1 = Plane(normal_vector=Vector(['0', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['1', '-1', '1']), constant_term='2')
+p3 = Plane(normal_vector=Vector(['1', '2', '-5']), constant_term='3')
+lu = LinearSystem([p1, p2, p3]).factorize()
+solution = lu.solve(['1', '2', '3'])
+expected = Vector([Decimal('23') / Decimal('9'), Decimal('7') / Decimal('9'),
+                   Decimal('2') / Decimal('9')])
+if not (is_near_zero(solution.basepoint.minus(expected).magnitude()) and
+        not solution.direction_vectors):
+    print 'factorization test case 1 failed'
+
+p1 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='2')
+lu = LinearSystem([p1, p2]).factorize()
+if lu.solve(['1', '2']) != LinearSystem.NO_SOLUTIONS_MSG:
+    print 'factorization test case 2 failed'
+
+solution = lu.solve(['1', '1'])
+if not (solution.basepoint == Vector(['1', '0', '0']) and
+        solution.direction_vectors == [Vector(['-1', '1', '0']),
+                                       Vector(['-1', '0', '1'])]):
+    print 'factorization test case 3 failed'
+
+p1 = Hyperplane(normal_vector=Vector([0.786, 0.786, 8.123, 1.111, -8.363]),
+                constant_term=-9.955)
+p2 = Hyperplane(normal_vector=Vector([0.131, -0.131, 7.05, -2.813, 1.19]),
+                constant_term=-1.991)
+p3 = Hyperplane(normal_vector=Vector([9.015, -5.873, -1.105, 2.013, -2.802]),
+                constant_term=-3.982)
+system = LinearSystem([p1, p2, p3])
+solutions = system.factorize().solve_many([[-9.955, -1.991, -3.982]])
+if str(solutions[0]) != str(system.compute_solution()):
+    print 'factorization test case 4 failed'
+
+
+# ***************
+
+p1 = Plane(normal_vector=Vector(['0', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['1', '-1', '1']), constant_term='2')
+p3 = Plane(normal_vector=Vector(['1', '2', '-5']), constant_term='3')
+solution = LinearSystem([p1, p2, p3]).compute_exact_solution()
+if not (solution.basepoint == Vector([Fraction(23, 9), Fraction(7, 9),
+                                      Fraction(2, 9)], FRACTION_BACKEND) and
+        not solution.direction_vectors):
+    print 'exact test case 1 failed'
+
+p1 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['2', '2', '2']), constant_term='3')
+s = LinearSystem([p1, p2])
+if not (s.compute_exact_solution() == LinearSystem.NO_SOLUTIONS_MSG and
+        s.exact_rank() == 1):
+    print 'exact test case 2 failed'
+
+p1 = Plane(normal_vector=Vector(['0.5', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['1', '2', '2']), constant_term='2')
+solution = LinearSystem([p1, p2]).compute_exact_solution()
+if not (solution.basepoint == Vector(['2', '0', '0'], FRACTION_BACKEND) and
+        solution.direction_vectors == [
+            Vector(['-2', '1', '0'], FRACTION_BACKEND),
+            Vector(['-2', '0', '1'], FRACTION_BACKEND)]):
+    print 'exact test case 3 failed'
+
+
+# ***************
+
+p1 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+s = LinearSystem([p1])
+if s.get_reduction().rank != 1:
+    print 'incremental test case 1 failed'
+
+s.append(Plane(normal_vector=Vector(['0', '1', '0']), constant_term='2'))
+s.append(Plane(normal_vector=Vector(['1', '1', '-1']), constant_term='3'))
+s.append(Plane(normal_vector=Vector(['1', '0', '-2']), constant_term='2'))
+reduction = s.get_reduction()
+if not (reduction.rank == 3 and reduction.is_consistent() and
+        str(reduction.compute_solution()) == str(s.compute_solution())):
+    print 'incremental test case 2 failed'
+
+s.append(Plane(normal_vector=Vector(['1', '1', '1']), constant_term='2'))
+if s.get_reduction().is_consistent():
+    print 'incremental test case 3 failed'
+
+s.remove(len(s) - 1)
+if str(s.get_reduction().compute_solution()) != str(s.compute_solution()):
+    print 'incremental test case 4 failed'
+
+p1 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+s = LinearSystem([p1], backend=FLOAT_BACKEND)
+s.get_reduction()
+s.append(Plane(normal_vector=Vector(['0', '1', '0']), constant_term='2'))
+if not (s.get_reduction().rank == 2 and
+        all(isinstance(value, float) for value in s.get_reduction().rows[1])):
+    print 'incremental test case 5 failed'
+
+
+# ***************
+
+p1 = Plane(normal_vector=Vector(['1e-8', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['1', '-1', '1']), constant_term='2')
+p3 = Plane(normal_vector=Vector(['1', '2', '-5']), constant_term='3')
+s = LinearSystem([p1, p2, p3], backend=DECIMAL_BACKEND)
+solution = s.compute_refined_solution()
+expected = s.compute_solution().basepoint
+if not (solution.residual <= 1e-20 and
+        is_near_zero(solution.basepoint.minus(expected).magnitude(), 1e-20)):
+    print 'refinement test case 1 failed'
+
+solution = LinearSystem([p1, p2, p3],
+                        backend=FLOAT_BACKEND).compute_refined_solution()
+if not (solution.basepoint.backend == DECIMAL_BACKEND and
+        is_near_zero(solution.basepoint.minus(expected).magnitude(), 1e-20)):
+    print 'refinement test case 2 failed'
+
+
+# ***************
+
+p0 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+p1 = Plane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
+p2 = Plane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
+p3 = Plane(normal_vector=Vector(['1', '0', '-2']), constant_term='2')
+s = LinearSystem([p0, p1, p2, p3])
+if not (s.rank() == 3 and s.is_consistent() and
+        s.solution_kind() == LinearSystem.UNIQUE_SOLUTION_MSG):
+    print 'rank test case 1 failed'
+
+p1 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['2', '2', '2']), constant_term='3')
+p3 = Plane(normal_vector=Vector(['0', '1', '1']), constant_term='1')
+s = LinearSystem([p1, p2, p3])
+if not (s.rank() == 2 and not s.is_consistent() and
+        s.solution_kind() == LinearSystem.NO_SOLUTIONS_MSG):
+    print 'rank test case 2 failed'
+
+p1 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['2', '2', '2']), constant_term='2')
+s = LinearSystem([p1, p2])
+if not (s.rank() == 1 and s.is_consistent() and
+        s.solution_kind() == LinearSystem.INF_SOLUTIONS_MSG):
+    print 'rank test case 3 failed'
+
+
+# ***************
+
+p0 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+p1 = Plane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
+p2 = Plane(normal_vector=Vector(['1', '1', '-2']), constant_term='3')
+p3 = Plane(normal_vector=Vector(['2', '2', '2']), constant_term='2')
+s = LinearSystem([p0, p1, p2, p3])
+pivot_info = s.compute_rref().pivot_info
+if not (pivot_info.pivot_indices == [0, 1, 2, -1] and
+        pivot_info.zero_rows == [3] and not pivot_info.free_variables and
+        pivot_info.is_consistent() and pivot_info.is_complete):
+    print 'pivot info test case 1 failed'
+
+s[3] = Plane(normal_vector=Vector(['2', '2', '2']), constant_term='3')
+rref = s.compute_rref()
+rescanned = LinearSystem(rref.planes).get_pivot_info()
+if not (s.pivot_info is None and rref.pivot_info.contradictory_rows == [3] and
+        rref.pivot_info.pivot_indices == rescanned.pivot_indices and
+        rescanned.contradictory_rows == [3]):
+    print 'pivot info test case 2 failed'
+
+p1 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['0', '0', '1']), constant_term='2')
+pivot_info = LinearSystem([p1, p2]).compute_triangular_form().pivot_info
+if not (pivot_info.pivot_columns == [0, 2] and pivot_info.rank == 2 and
+        pivot_info.free_variables == [1]):
+    print 'pivot info test case 3 failed'
+
+
+# ***************
+
+p1 = Plane(normal_vector=Vector(['1', '2', '3']), constant_term='4')
+p2 = Plane(normal_vector=Vector(['-2', '-4', '-6']), constant_term='-8')
+p3 = Plane(normal_vector=Vector(['0', '1', '1']), constant_term='1')
+p4 = Plane(normal_vector=Vector(['1', '2', '3']), constant_term='4')
+p5 = Plane(normal_vector=Vector(['2', '4', '6']), constant_term='9')
+if not (p1.canonical_form() == p2.canonical_form() and
+        hash(p1) == hash(p2) and hash(p1) != hash(p5)):
+    print 'duplicate test case 1 failed'
+
+s = LinearSystem([p1, p2, p3, p4])
+if not (len(s.remove_duplicate_equations()) == 2 and len(s) == 4 and
+        str(s.compute_solution(remove_duplicates=True)) ==
+        str(s.compute_solution())):
+    print 'duplicate test case 2 failed'
+
+s = LinearSystem([p1, p2, p5])
+s.remove_duplicate_equations(inplace=True)
+if not (len(s) == 2 and
+        s.compute_solution() == LinearSystem.NO_SOLUTIONS_MSG):
+    print 'duplicate test case 3 failed'
+
+p1 = Hyperplane(normal_vector=Vector(['1', '4e-10']), constant_term='1')
+p2 = Hyperplane(normal_vector=Vector(['1', '0']), constant_term='1')
+solution = LinearSystem([p1, p2]).compute_solution(remove_duplicates=True)
+if not (p1.canonical_form() != p2.canonical_form() and
+        not solution.direction_vectors and
+        solution.basepoint == Vector(['1', '0'])):
+    print 'duplicate test case 4 failed'
+
+
+# ***************
+
+set_backend(FRACTION_BACKEND)
+p1 = Plane(Vector([5.862, 1.178, -10.366], DECIMAL_BACKEND), -8.15)
+p2 = Plane(Vector([-2.931, -0.589, 5.183], DECIMAL_BACKEND), -4.075)
+if LinearSystem([p1, p2]).solution_kind() != LinearSystem.NO_SOLUTIONS_MSG:
+    print 'backend tolerance test case 1 failed'
+
+p1 = Plane(Vector([8.631, 5.112, -1.816], DECIMAL_BACKEND), -5.113)
+p2 = Plane(Vector([4.315, 11.132, -5.27], DECIMAL_BACKEND), -6.775)
+p3 = Plane(Vector([-2.158, 3.01, -1.727], DECIMAL_BACKEND), -0.831)
+if (LinearSystem([p1, p2, p3]).solution_kind() !=
+        LinearSystem.INF_SOLUTIONS_MSG):
+    print 'backend tolerance test case 2 failed'
+
+set_backend(FLOAT_BACKEND)
+if is_near_zero(Decimal('5e-10')):
+    print 'backend tolerance test case 3 failed'
+set_backend(DECIMAL_BACKEND)
+
+
+# ***************
+
+p1 = Plane(normal_vector=Vector(['4', '1', '0']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['1', '3', '1']), constant_term='2')
+p3 = Plane(normal_vector=Vector(['0', '1', '2']), constant_term='3')
+s = LinearSystem([p1, p2, p3])
+expected = s.compute_solution().basepoint
+for method in ['jacobi', 'gauss_seidel', 'conjugate_gradient', 'gmres']:
+    result = s.compute_iterative_solution(method)
+    if not (result.converged and
+            is_near_zero(result.solution.minus(expected).magnitude(), 1e-8)):
+        print 'iterative test case 1 failed for {}'.format(method)
+
+result = s.compute_iterative_solution('gmres', restart=2)
+if not (result.converged and
+        is_near_zero(result.solution.minus(expected).magnitude(), 1e-8)):
+    print 'iterative test case 2 failed'
+
+result = s.compute_iterative_solution('gmres', initial_guess=expected)
+if not (result.converged and result.iterations == 0):
+    print 'iterative test case 3 failed'
+
+result = s.compute_iterative_solution('jacobi', tolerance=1e-30,
+                                      max_iterations=3)
+if not (not result.converged and result.iterations == 3):
+    print 'iterative test case 4 failed'
+
+
+# ***************
+
+p1 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+p2 = Plane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
+p3 = Plane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
+solution = LinearSystem([p1, p2, p3], backend=FLOAT_BACKEND).compute_solution()
+if not (solution.basepoint.backend == FLOAT_BACKEND and
+        all(isinstance(x, float) for x in solution.basepoint) and
+        solution.basepoint == Vector([0.0, 2.0, -1.0], FLOAT_BACKEND)):
+    print 'float backend test case failed'
+
+# ***************
+
+try:
+    Plane(normal_vector=Vector(['1', '2']), constant_term='1')
+    print 'dimension test case failed'
+except Exception as e:
+    if str(e) != Hyperplane.NORMAL_VEC_MUST_MATCH_DIM_MSG:
+        raise e
+
+
+set_backend(caller_backend)
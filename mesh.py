@@ -0,0 +1,95 @@
+import numpy as np
+
+DEFAULT_MESH_CHUNK_SIZE = 65536
+
+TRIANGLES_MUST_BE_3D_TRIPLES_MSG = ('Triangles must be given as an F x 3 x 3 '
+                                    'array of vertex triples, or as vertices '
+                                    'plus an F x 3 array of face indices')
+
+
+def _as_triangles(triangles, faces=None):
+    # Index before converting, so a chunk of faces only reads and copies the
+    # vertices it uses, not the whole (possibly memory mapped) vertex array
+    if faces is not None:
+        triangles = np.asarray(triangles)[np.asarray(faces)]
+    triangles = np.asarray(triangles, dtype=float)
+
+    if triangles.ndim != 3 or triangles.shape[1:] != (3, 3):
+        raise Exception(TRIANGLES_MUST_BE_3D_TRIPLES_MSG)
+
+    return triangles
+
+
+def face_normals_and_areas(triangles, faces=None):
+    """
+    Computes the unit normal and the area of every triangle in one pass.
+
+    `triangles` is an F x 3 x 3 array of vertex triples, or a V x 3 array of
+    vertices when `faces` holds the F x 3 vertex indices of each triangle.
+    Returns (normals, areas, total_area). Degenerate triangles get a zero
+    normal and a zero area.
+    """
+    triangles = _as_triangles(triangles, faces)
+
+    cross_products = np.cross(triangles[:, 1] - triangles[:, 0],
+                              triangles[:, 2] - triangles[:, 0])
+    parallelogram_areas = np.sqrt(np.einsum('ij,ij->i', cross_products,
+                                            cross_products))
+
+    normals = np.zeros_like(cross_products)
+    nondegenerate = parallelogram_areas > 0
+    normals[nondegenerate] = (cross_products[nondegenerate] /
+                              parallelogram_areas[nondegenerate, None])
+    areas = parallelogram_areas / 2
+
+    return normals, areas, areas.sum()
+
+
+def iter_triangle_chunks(triangles, faces=None,
+                         chunk_size=DEFAULT_MESH_CHUNK_SIZE):
+    """
+    Slices a triangle array (or vertices plus faces) into chunks of at most
+    `chunk_size` triangles. Works with np.memmap inputs, so only one chunk
+    of a mesh larger than RAM is loaded at a time.
+    """
+    num_triangles = len(faces) if faces is not None else len(triangles)
+
+    for start in range(0, num_triangles, chunk_size):
+        stop = min(start + chunk_size, num_triangles)
+        if faces is not None:
+            yield _as_triangles(triangles, faces[start:stop])
+        else:
+            yield _as_triangles(triangles[start:stop])
+
+
+def iter_face_normals_and_areas(triangle_chunks):
+    """
+    Streaming variant of face_normals_and_areas. Takes any iterable of
+    F x 3 x 3 chunks (see iter_triangle_chunks) and yields (normals, areas)
+    for each of them.
+    """
+    for chunk in triangle_chunks:
+        normals, areas, _ = face_normals_and_areas(chunk)
+        yield normals, areas
+
+
+def total_area(triangle_chunks):
+    return sum(areas.sum() for _, areas in
+               iter_face_normals_and_areas(triangle_chunks))
+
+
+if __name__ == '__main__':
+    # unit cube split in 12 triangles, total area 6
+    vertices = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+                [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]]
+    faces = np.array([[0, 2, 1], [0, 3, 2], [4, 5, 6], [4, 6, 7],
+                      [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
+                      [1, 2, 6], [1, 6, 5], [0, 4, 7], [0, 7, 3]])
+
+    normals, areas, area = face_normals_and_areas(vertices, faces)
+    print('face normals: {}'.format(normals.tolist()))
+    print('face areas: {}'.format(areas.tolist()))
+    print('total area: {}'.format(area))
+
+    chunks = iter_triangle_chunks(vertices, faces, chunk_size=5)
+    print('streamed total area: {}'.format(total_area(chunks)))
@@ -0,0 +1,152 @@
+import numpy as np
+from hyperplane import Hyperplane
+from plane import Plane
+from vector import Vector
+
+DEFAULT_HYPOTHESIS_BATCH_SIZE = 64
+DEFAULT_POINT_CHUNK_SIZE = 65536
+DEFAULT_SCORING_SAMPLE_SIZE = 16384
+
+TOO_FEW_POINTS_MSG = ('At least d points are needed to fit a hyperplane in d '
+                      'dimensions')
+NO_HYPERPLANE_FOUND_MSG = 'Every sampled subset of points was degenerate'
+
+
+def _hypotheses(samples):
+    """
+    Hyperplanes through each B x d x d sample of points, as unit normals
+    and constant terms. Degenerate samples get a zero normal.
+    """
+    differences = samples[:, 1:] - samples[:, :1]
+    if samples.shape[2] == 3:
+        normals = np.cross(differences[:, 0], differences[:, 1])
+    else:
+        # The normal spans the null space of the d - 1 difference vectors
+        normals = np.linalg.svd(differences)[2][:, -1]
+        ranks = np.linalg.matrix_rank(differences)
+        normals[ranks < samples.shape[2] - 1] = 0
+
+    magnitudes = np.sqrt(np.einsum('ij,ij->i', normals, normals))
+    nondegenerate = magnitudes > 0
+    normals[nondegenerate] /= magnitudes[nondegenerate, None]
+    normals[~nondegenerate] = 0
+
+    constant_terms = np.einsum('ij,ij->i', normals, samples[:, 0])
+    return normals, constant_terms, nondegenerate
+
+
+def _count_inliers(points, normals, constant_terms, threshold, chunk_size):
+    counts = np.zeros(len(normals), dtype=int)
+    for start in range(0, len(points), chunk_size):
+        distances = np.dot(points[start:start + chunk_size], normals.T)
+        counts += (np.abs(distances - constant_terms) < threshold).sum(axis=0)
+    return counts
+
+
+def _least_squares_hyperplane(points):
+    """
+    Total least squares fit: the hyperplane through the centroid whose
+    normal is the direction of least variance
+    """
+    centroid = points.mean(axis=0)
+    centered = points - centroid
+    normal = np.linalg.eigh(np.dot(centered.T, centered))[1][:, 0]
+    return normal, np.dot(normal, centroid)
+
+
+def fit_hyperplane_ransac(points, threshold, confidence=0.99,
+                          max_iterations=1000,
+                          batch_size=DEFAULT_HYPOTHESIS_BATCH_SIZE,
+                          chunk_size=DEFAULT_POINT_CHUNK_SIZE,
+                          scoring_sample_size=DEFAULT_SCORING_SAMPLE_SIZE,
+                          seed=None):
+    """
+    Robustly fits a hyperplane to a P x d point array with RANSAC.
+
+    Hypotheses are drawn `batch_size` at a time, each through d random
+    points, and their inliers (points closer than `threshold`) are counted
+    in one vectorized pass over a fixed random sample of
+    `scoring_sample_size` points. Only the best hypothesis of each batch is
+    then counted over all the points, in chunks of `chunk_size`. The number
+    of hypotheses adapts to the best inlier ratio w found so far: sampling
+    stops once log(1 - confidence) / log(1 - w^d) hypotheses were tried,
+    or after `max_iterations`. The best hypothesis is then refined with a
+    least squares fit over its inliers.
+
+    Returns (hyperplane, inliers): a Plane for 3D points, a Hyperplane
+    otherwise, and the boolean inlier mask of the refined fit.
+    """
+    points = np.asarray(points, dtype=float)
+    num_points, dimension = points.shape
+    if num_points < dimension:
+        raise Exception(TOO_FEW_POINTS_MSG)
+
+    random_state = np.random.RandomState(seed)
+    scoring_points = points
+    if num_points > scoring_sample_size:
+        scoring_points = points[random_state.choice(
+            num_points, scoring_sample_size, replace=False)]
+
+    best_count = 0
+    best_normal = best_constant_term = None
+
+    iterations = 0
+    required_iterations = max_iterations
+    while iterations < min(required_iterations, max_iterations):
+        indices = random_state.randint(num_points,
+                                       size=(batch_size, dimension))
+        normals, constant_terms, nondegenerate = _hypotheses(points[indices])
+        counts = _count_inliers(scoring_points, normals, constant_terms,
+                                threshold, chunk_size)
+        counts[~nondegenerate] = -1
+        iterations += batch_size
+
+        best = np.argmax(counts)
+        if counts[best] < 0:
+            continue
+        count = _count_inliers(points, normals[best:best + 1],
+                               constant_terms[best:best + 1], threshold,
+                               chunk_size)[0]
+        if count > best_count or best_normal is None:
+            best_count = count
+            best_normal = normals[best]
+            best_constant_term = constant_terms[best]
+
+            inlier_ratio = float(best_count) / num_points
+            failure_probability = 1 - inlier_ratio ** dimension
+            if failure_probability <= 0:
+                break
+            if failure_probability < 1:
+                required_iterations = (np.log(1 - confidence) /
+                                       np.log(failure_probability))
+
+    if best_normal is None:
+        raise Exception(NO_HYPERPLANE_FOUND_MSG)
+
+    inliers = np.abs(np.dot(points, best_normal) -
+                     best_constant_term) < threshold
+    normal, constant_term = _least_squares_hyperplane(points[inliers])
+    inliers = np.abs(np.dot(points, normal) - constant_term) < threshold
+
+    normal_vector = Vector(normal.tolist())
+    if dimension == 3:
+        return Plane(normal_vector, constant_term), inliers
+    return Hyperplane(normal_vector=normal_vector,
+                      constant_term=constant_term), inliers
+
+
+if __name__ == '__main__':
+    # noisy samples of the plane x + 2y - 2z = 3 among uniform outliers
+    random_state = np.random.RandomState(0)
+    xy = random_state.uniform(-10, 10, size=(700, 2))
+    z = (xy[:, 0] + 2 * xy[:, 1] - 3) / 2
+    on_plane = np.column_stack([xy, z])
+    on_plane += random_state.normal(scale=0.01, size=on_plane.shape)
+    outliers = random_state.uniform(-10, 10, size=(300, 3))
+    points = np.concatenate([on_plane, outliers])
+
+    plane, inliers = fit_hyperplane_ransac(points, threshold=0.05, seed=0)
+    normal = np.array(plane.normal_vector.coordinates, dtype=float)
+    scale = 3 / float(plane.constant_term)
+    print('fitted plane: {}'.format(np.round(normal * scale, 2).tolist()))
+    print('inliers: {}'.format(inliers.sum()))
@@ -0,0 +1,107 @@
+import numpy as np
+from vector import Vector
+from vector_batch import VectorBatch, as_vector_batch
+
+
+class Projector(object):
+    """
+    Projects vectors onto the subspace spanned by a fixed basis.
+
+    The basis is orthonormalized once at construction (linearly dependent
+    basis vectors are dropped), so every later call is a couple of matrix
+    products with no norm or basis work. project, reject and coefficients
+    accept a single Vector or a VectorBatch; iter_project, iter_reject and
+    iter_coefficients apply them lazily to a stream of either.
+    """
+
+    BASIS_MUST_BE_NONZERO_MSG = ('The basis must contain at least one '
+                                 'nonzero vector')
+    ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG = ('The vectors should live in the '
+                                           'same dimension as the basis')
+
+    def __init__(self, basis, tolerance=1e-10):
+        if isinstance(basis, Vector):
+            basis = [basis]
+        basis = as_vector_batch(basis).coordinates
+
+        _, singular_values, rows = np.linalg.svd(basis, full_matrices=False)
+        if not singular_values.size or singular_values[0] <= tolerance:
+            raise Exception(self.BASIS_MUST_BE_NONZERO_MSG)
+        rank = int(np.sum(singular_values > tolerance * singular_values[0]))
+
+        self.basis = rows[:rank]
+        self.rank = rank
+        self.dimension = basis.shape[1]
+
+    def _coordinates(self, vectors):
+        coordinates = as_vector_batch([vectors]
+                                      if isinstance(vectors, Vector)
+                                      else vectors).coordinates
+        if coordinates.shape[1] != self.dimension:
+            raise Exception(self.ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
+        return coordinates
+
+    def _coefficients(self, coordinates):
+        return np.dot(coordinates, self.basis.T)
+
+    def _projections(self, coordinates):
+        return np.dot(self._coefficients(coordinates), self.basis)
+
+    @staticmethod
+    def _as_input_type(coordinates, vectors):
+        if isinstance(vectors, Vector):
+            return Vector(coordinates[0].tolist(), vectors.backend)
+        return VectorBatch(coordinates)
+
+    def coefficients(self, vectors):
+        """
+        Coordinates of the projection in the orthonormalized basis, a list
+        for a single Vector and an N x rank array for a batch
+        """
+        coefficients = self._coefficients(self._coordinates(vectors))
+        if isinstance(vectors, Vector):
+            return coefficients[0].tolist()
+        return coefficients
+
+    def project(self, vectors):
+        projections = self._projections(self._coordinates(vectors))
+        return self._as_input_type(projections, vectors)
+
+    def reject(self, vectors):
+        coordinates = self._coordinates(vectors)
+        rejections = coordinates - self._projections(coordinates)
+        return self._as_input_type(rejections, vectors)
+
+    def iter_coefficients(self, stream):
+        for vectors in stream:
+            yield self.coefficients(vectors)
+
+    def iter_project(self, stream):
+        for vectors in stream:
+            yield self.project(vectors)
+
+    def iter_reject(self, stream):
+        for vectors in stream:
+            yield self.reject(vectors)
+
+
+if __name__ == '__main__':
+    v = Vector([3.039, 1.879])
+    projector = Projector(Vector([0.825, 2.036]))
+    print('projected vector is: {}'.format(projector.project(v)))
+
+    v = Vector([-9.88, -3.264, -8.159])
+    projector = Projector(Vector([-2.155, -9.353, -9.473]))
+    print('orthogonal vector is: {}'.format(projector.reject(v)))
+
+    projector = Projector([Vector([1, 0, 0]), Vector([1, 1, 0]),
+                           Vector([2, 1, 0])])
+    print('rank of the basis: {}'.format(projector.rank))
+
+    batch = VectorBatch([[1, 2, 3], [4, 5, 6]])
+    print('projected batch: {}'.format(projector.project(batch)))
+    print('rejected batch: {}'.format(projector.reject(batch)))
+
+    stream = (Vector([i, i, i]) for i in range(3))
+    for rejection in projector.iter_reject(stream):
+        print('streamed rejection: {}'.format(rejection))
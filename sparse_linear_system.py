@@ -0,0 +1,235 @@
+from heapq import heappop, heappush
+from linear_system import LinearSystem, Parametrization
+from vector import (BACKEND_CONVERTERS, FLOAT_BACKEND, Vector, get_backend,
+                    is_near_zero)
+
+
+class SparseLinearSystem(object):
+    """
+    Linear system stored row-wise as {column: value} dicts (CSR style) plus
+    the set of rows touching every column (CSC style), so memory and
+    elimination time scale with the number of nonzeros.
+
+    compute_solution runs Gaussian elimination with a Markowitz /
+    approximate minimum degree pivot order: it always eliminates the column
+    with the fewest nonzeros left and, among the rows that pass the
+    threshold partial pivoting test, picks the shortest one. This keeps the
+    fill-in low on mesh and graph systems. The result is reported the same
+    way as LinearSystem.compute_solution, although with infinitely many
+    solutions the free variables picked may differ from the dense rref.
+
+    Elimination runs in pure Python, so it is meant for systems up to about
+    10^4 unknowns: the 5-point Laplacian of a 100 x 100 grid takes around
+    10 seconds.
+    """
+
+    ALL_ROWS_MUST_BE_IN_SAME_DIM_MSG = ('All rows in the system should '
+                                        'live in the same dimension')
+    CONSTANT_TERMS_MUST_MATCH_NUM_EQUATIONS_MSG = (
+        'There must be one constant term per equation')
+
+    def __init__(self, rows, constant_terms, dimension, backend=None):
+        if backend is None:
+            backend = get_backend()
+        if len(rows) != len(constant_terms):
+            raise Exception(self.CONSTANT_TERMS_MUST_MATCH_NUM_EQUATIONS_MSG)
+        convert = BACKEND_CONVERTERS[backend]
+
+        self.rows = []
+        for row in rows:
+            if any(not 0 <= col < dimension for col in row):
+                raise Exception(self.ALL_ROWS_MUST_BE_IN_SAME_DIM_MSG)
+            values = dict((col, convert(value)) for col, value in row.items())
+            self.rows.append(dict((col, value) for col, value in values.items()
+                                  if value))
+
+        self.constant_terms = [convert(c) for c in constant_terms]
+        self.dimension = dimension
+        self.backend = backend
+
+    @classmethod
+    def from_planes(cls, planes):
+        rows = []
+        for p in planes:
+            n = p.normal_vector
+            if n.is_sparse:
+                rows.append(dict(n.entries))
+            else:
+                rows.append(dict((col, value) for col, value
+                                 in enumerate(n.coordinates) if value))
+
+        system = LinearSystem(planes)
+        return cls(rows, [p.constant_term for p in planes],
+                   system.dimension, system.backend)
+
+    @classmethod
+    def from_csr(cls, indptr, indices, data, constant_terms, dimension,
+                 backend=None):
+        rows = [dict(zip(indices[indptr[i]:indptr[i + 1]],
+                         data[indptr[i]:indptr[i + 1]]))
+                for i in range(len(indptr) - 1)]
+        return cls(rows, constant_terms, dimension, backend)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def nnz(self):
+        return sum(len(row) for row in self.rows)
+
+    def _eliminate(self, pivot_threshold):
+        """
+        Returns the pivot sequence [(row, col)], the reduced rows and
+        constant terms, and the indices of the rows left without a pivot
+        """
+        rows = [dict(row) for row in self.rows]
+        constant_terms = list(self.constant_terms)
+        threshold = BACKEND_CONVERTERS[self.backend](pivot_threshold)
+
+        column_rows = dict((col, set()) for col in range(self.dimension))
+        for i, row in enumerate(rows):
+            for col in row:
+                column_rows[col].add(i)
+
+        heap = [(len(row_set), col) for col, row_set in column_rows.items()]
+        heap.sort()
+        eliminated_columns = set()
+        pivots = []
+
+        while heap:
+            count, col = heappop(heap)
+            if col in eliminated_columns or count != len(column_rows[col]):
+                continue
+            eliminated_columns.add(col)
+            if not count:
+                continue
+
+            candidates = column_rows[col]
+            largest = max(abs(rows[i][col]) for i in candidates)
+            if is_near_zero(largest):
+                continue
+            cutoff = threshold * largest
+            pivot_row = min((i for i in candidates
+                             if abs(rows[i][col]) >= cutoff),
+                            key=lambda i: (len(rows[i]), i))
+            pivot_values = rows[pivot_row]
+            pivot = pivot_values[col]
+
+            for other_col in pivot_values:
+                column_rows[other_col].discard(pivot_row)
+
+            touched_columns = set(pivot_values)
+            for i in list(candidates):
+                values = rows[i]
+                alpha = -values[col] / pivot
+                for other_col, value in pivot_values.items():
+                    new_value = values.get(other_col, 0) + alpha * value
+                    # Only exact cancellations are dropped, dropping small
+                    # fill-in would turn this into an incomplete factorization
+                    if other_col == col or not new_value:
+                        if other_col in values:
+                            del values[other_col]
+                            column_rows[other_col].discard(i)
+                    else:
+                        if other_col not in values:
+                            column_rows[other_col].add(i)
+                        values[other_col] = new_value
+                constant_terms[i] = (constant_terms[i] +
+                                     alpha * constant_terms[pivot_row])
+
+            for other_col in touched_columns:
+                if other_col not in eliminated_columns:
+                    heappush(heap, (len(column_rows[other_col]), other_col))
+
+            pivots.append((pivot_row, col))
+
+        pivot_rows = set(row for row, _ in pivots)
+        remaining_rows = [i for i in range(len(rows)) if i not in pivot_rows]
+        return pivots, rows, constant_terms, remaining_rows
+
+    def _back_substitute(self, pivots, rows, constant_terms, free_values,
+                         homogeneous):
+        convert = BACKEND_CONVERTERS[self.backend]
+        solution = dict(free_values)
+
+        for row, col in reversed(pivots):
+            values = rows[row]
+            total = convert(0) if homogeneous else constant_terms[row]
+            for other_col, value in values.items():
+                if other_col != col:
+                    total = total - value * solution.get(other_col, 0)
+            solution[col] = total / values[col]
+
+        return [solution.get(col, 0) for col in range(self.dimension)]
+
+    def compute_solution(self, pivot_threshold=0.1):
+        pivots, rows, constant_terms, remaining_rows = \
+            self._eliminate(pivot_threshold)
+
+        for i in remaining_rows:
+            if not is_near_zero(constant_terms[i]):
+                return LinearSystem.NO_SOLUTIONS_MSG
+
+        pivot_columns = set(col for _, col in pivots)
+        free_variable_indices = [col for col in range(self.dimension)
+                                 if col not in pivot_columns]
+
+        basepoint = self._back_substitute(pivots, rows, constant_terms, {},
+                                          homogeneous=False)
+        direction_vectors = [
+            Vector(self._back_substitute(pivots, rows, constant_terms,
+                                         {free_var: 1}, homogeneous=True),
+                   self.backend)
+            for free_var in free_variable_indices]
+
+        return Parametrization(Vector(basepoint, self.backend),
+                               direction_vectors)
+
+
+if __name__ == '__main__':
+    # path graph Laplacian plus identity, x_i - x_{i+1} couplings
+    size = 6
+    rows = []
+    for i in range(size):
+        row = {i: 3}
+        if i > 0:
+            row[i - 1] = -1
+        if i < size - 1:
+            row[i + 1] = -1
+        rows.append(row)
+
+    system = SparseLinearSystem(rows, ['1'] * size, size)
+    print(system.compute_solution())
+
+    # 5-point Laplacian of a 50 x 50 grid, the residual has to stay at
+    # rounding level however much fill-in the elimination creates
+    side = 50
+    size = side * side
+    rows = []
+    for i in range(size):
+        row = {i: 4.0}
+        x, y = i % side, i // side
+        if x > 0:
+            row[i - 1] = -1.0
+        if x < side - 1:
+            row[i + 1] = -1.0
+        if y > 0:
+            row[i - side] = -1.0
+        if y < side - 1:
+            row[i + side] = -1.0
+        rows.append(row)
+    constant_terms = [float(i % 7) for i in range(size)]
+
+    system = SparseLinearSystem(rows, constant_terms, size, FLOAT_BACKEND)
+    x = system.compute_solution().basepoint
+    residual = max(abs(sum(value * x[col] for col, value in row.items()) - c)
+                   for row, c in zip(rows, constant_terms))
+    if residual > 1e-9:
+        print('grid laplacian test case failed')
+
+    # entries given as strings are only dropped once converted
+    if 1 in SparseLinearSystem([{0: '1', 1: '0'}], ['1'], 2).rows[0]:
+        print('zero entry test case failed')
+
+    rows = [{0: 1, 2: 1}, {1: 1}, {0: 2, 2: 2}]
+    print(SparseLinearSystem(rows, ['1', '2', '2'], 3).compute_solution())
+    print(SparseLinearSystem(rows, ['1', '2', '3'], 3).compute_solution())
@@ -0,0 +1,163 @@
+from math import sqrt
+from vector import (BACKEND_CONVERTERS, UNKNOWN_BACKEND_MSG, Vector,
+                    get_backend)
+
+
+class SparseVector(Vector):
+    """
+    Vector that only stores its nonzero coordinates as an index -> value
+    dict, so plus, minus, times_scalar, dot_product, magnitude and is_zero
+    cost O(nnz) instead of O(dimension).
+
+    It has the same API as Vector and can be mixed with dense vectors:
+    sparse-sparse operations stay sparse, while plus/minus with a dense
+    vector return a dense Vector. `coordinates` still gives the dense tuple
+    for code that needs it, at O(dimension) cost.
+    """
+
+    DIMENSION_MUST_BE_POSITIVE_MSG = 'The dimension must be positive'
+    INDEX_OUT_OF_RANGE_MSG = 'Sparse vector index out of range'
+
+    is_sparse = True
+
+    __slots__ = ('entries',)
+
+    def __init__(self, dimension, entries=None, backend=None):
+        if backend is None:
+            backend = get_backend()
+        if backend not in BACKEND_CONVERTERS:
+            raise ValueError(UNKNOWN_BACKEND_MSG)
+        if dimension < 1:
+            raise ValueError(self.DIMENSION_MUST_BE_POSITIVE_MSG)
+        convert = BACKEND_CONVERTERS[backend]
+
+        if entries is None:
+            entries = {}
+        if isinstance(entries, dict):
+            entries = entries.items()
+
+        nonzero_entries = {}
+        for index, value in entries:
+            if not 0 <= index < dimension:
+                raise IndexError(self.INDEX_OUT_OF_RANGE_MSG)
+            value = convert(value)
+            if value:
+                nonzero_entries[index] = value
+
+        set_attribute = object.__setattr__
+        set_attribute(self, 'entries', nonzero_entries)
+        set_attribute(self, 'dimension', dimension)
+        set_attribute(self, 'backend', backend)
+        set_attribute(self, '_magnitude', None)
+        set_attribute(self, '_normalized', None)
+        set_attribute(self, '_is_zero', None)
+
+    @classmethod
+    def from_dense(cls, coordinates, backend=None):
+        if isinstance(coordinates, Vector):
+            if backend is None:
+                backend = coordinates.backend
+            coordinates = coordinates.coordinates
+        return cls(len(coordinates), enumerate(coordinates), backend)
+
+    def to_dense(self):
+        return Vector(self.coordinates, self.backend)
+
+    @property
+    def coordinates(self):
+        zero = BACKEND_CONVERTERS[self.backend](0)
+        return tuple([self.entries.get(i, zero)
+                      for i in range(self.dimension)])
+
+    @property
+    def indices(self):
+        return sorted(self.entries)
+
+    def __reduce__(self):
+        return (SparseVector, (self.dimension, self.entries, self.backend))
+
+    def __iter__(self):
+        return iter(self.coordinates)
+
+    def __len__(self):
+        return self.dimension
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.dimension
+        if not 0 <= i < self.dimension:
+            raise IndexError(self.INDEX_OUT_OF_RANGE_MSG)
+        return self.entries.get(i, BACKEND_CONVERTERS[self.backend](0))
+
+    def __str__(self):
+        return 'SparseVector: dimension {}, {}'.format(
+            self.dimension,
+            dict((i, round(self.entries[i], 3)) for i in self.indices))
+
+    def __eq__(self, v):
+        if v.is_sparse:
+            return (self.dimension == v.dimension and
+                    self.entries == v.entries)
+        return self.coordinates == v.coordinates
+
+    __hash__ = Vector.__hash__
+
+    def is_zero(self):
+        return not self.entries
+
+    def plus(self, other):
+        if not other.is_sparse:
+            coordinates = list(other.coordinates)
+            for index, value in self.entries.items():
+                coordinates[index] = value + coordinates[index]
+            return Vector(coordinates, self.backend)
+
+        entries = dict(self.entries)
+        for index, value in other.entries.items():
+            if index in entries:
+                entries[index] = entries[index] + value
+            else:
+                entries[index] = value
+        return SparseVector(self.dimension, entries, self.backend)
+
+    def minus(self, other):
+        return self.plus(other.times_scalar(-1))
+
+    def times_scalar(self, factor):
+        factor = BACKEND_CONVERTERS[self.backend](factor)
+        return SparseVector(self.dimension,
+                            [(index, factor * value)
+                             for index, value in self.entries.items()],
+                            self.backend)
+
+    def magnitude(self):
+        if self._magnitude is None:
+            convert = BACKEND_CONVERTERS[self.backend]
+            magnitude = convert(sqrt(sum([value * value for value
+                                          in self.entries.values()])))
+            object.__setattr__(self, '_magnitude', magnitude)
+        return self._magnitude
+
+    def dot_product(self, other):
+        if other.is_sparse and len(other.entries) < len(self.entries):
+            return other.dot_product(self)
+        return sum(value * other[index]
+                   for index, value in self.entries.items())
+
+
+if __name__ == '__main__':
+    v = SparseVector(10000, {3: 1.5, 42: -2, 9999: 4})
+    w = SparseVector(10000, {42: 2, 100: 7})
+    print('addition: {}'.format(v.plus(w)))
+    print('subtraction: {}'.format(v.minus(w)))
+    print('dot product: {}'.format(v.dot_product(w)))
+    print('magnitude: {}'.format(round(v.magnitude(), 3)))
+    print('normalization: {}'.format(v.normalize()))
+    print('is orthogonal: {}'.format(v.is_orthogonal(w)))
+
+    dense = Vector([1, 2, 3])
+    sparse = SparseVector.from_dense([0, 0, 3])
+    print('mixed addition: {}'.format(dense.plus(sparse)))
+    print('mixed subtraction: {}'.format(dense.minus(sparse)))
+    print('mixed dot product: {}'.format(dense.dot_product(sparse)))
+    print('is parallel: {}'.format(sparse.is_parallel(Vector([0, 0, 1]))))
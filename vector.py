@@ -1,21 +1,93 @@
 from math import acos, sqrt, pi
 from decimal import Decimal, getcontext
+from fractions import Fraction
 
 getcontext().prec = 30
 
+DECIMAL_BACKEND = 'decimal'
+FLOAT_BACKEND = 'float'
+FRACTION_BACKEND = 'fraction'
+
+BACKEND_CONVERTERS = {
+    DECIMAL_BACKEND: Decimal,
+    FLOAT_BACKEND: float,
+    FRACTION_BACKEND: Fraction,
+}
+
+# The fraction backend is exact, so only an actual zero counts as zero
+NEAR_ZERO_TOLERANCES = {
+    DECIMAL_BACKEND: 1e-10,
+    FLOAT_BACKEND: 1e-9,
+    FRACTION_BACKEND: 0,
+}
+
+UNKNOWN_BACKEND_MSG = 'Unknown numeric backend, use one of: {}'.format(
+    ', '.join(sorted(BACKEND_CONVERTERS)))
+
+default_backend = DECIMAL_BACKEND
+
+
+def set_backend(backend):
+    """
+    Sets the numeric backend used by objects created without an explicit one.
+    Decimal keeps 30 significant digits, float stores native float64 values
+    and fraction keeps exact rationals.
+    """
+    global default_backend
+    if backend not in BACKEND_CONVERTERS:
+        raise ValueError(UNKNOWN_BACKEND_MSG)
+    default_backend = backend
+
+
+def get_backend():
+    return default_backend
+
 
 class MyDecimal(Decimal):
-    def is_near_zero(self, eps=1e-10):
+    def is_near_zero(self, eps=None):
+        if eps is None:
+            eps = NEAR_ZERO_TOLERANCES[DECIMAL_BACKEND]
+        if not eps:
+            return not self
         return abs(self) < eps
 
 
+def is_near_zero(value, eps=None):
+    """
+    The default tolerance follows the type of `value`, not the default
+    backend, so explicitly Decimal systems keep theirs after set_backend
+    """
+    if isinstance(value, float):
+        if eps is None:
+            eps = NEAR_ZERO_TOLERANCES[FLOAT_BACKEND]
+        return abs(value) < eps
+    if isinstance(value, Fraction):
+        if not eps:
+            return not value
+        return abs(value) < eps
+    return MyDecimal(value).is_near_zero(eps)
+
+
 class Vector(object):
-    def __init__(self, coordinates):
+
+    VECTOR_IS_IMMUTABLE_MSG = 'Vectors are immutable'
+
+    is_sparse = False
+
+    __slots__ = ('coordinates', 'dimension', 'backend',
+                 '_magnitude', '_normalized', '_is_zero')
+
+    def __init__(self, coordinates, backend=None):
+        if backend is None:
+            backend = default_backend
+        if backend not in BACKEND_CONVERTERS:
+            raise ValueError(UNKNOWN_BACKEND_MSG)
+        convert = BACKEND_CONVERTERS[backend]
+
         try:
             if not coordinates:
                 raise ValueError
-            self.coordinates = tuple([Decimal(c) for c in coordinates])
-            self.dimension = len(coordinates)
+            coordinates = tuple([convert(c) for c in coordinates])
 
         except ValueError:
             raise ValueError('The coordinates must be nonempty')
@@ -23,20 +95,33 @@ class Vector(object):
         except TypeError:
             raise TypeError('The coordinates must be an iterable')
 
-    def __iter__(self):
-        self.current = 0
+        set_attribute = object.__setattr__
+        set_attribute(self, 'coordinates', coordinates)
+        set_attribute(self, 'dimension', len(coordinates))
+        set_attribute(self, 'backend', backend)
+
+        # Derived quantities are computed on first use and then cached
+        set_attribute(self, '_magnitude', None)
+        set_attribute(self, '_normalized', None)
+        set_attribute(self, '_is_zero', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(self.VECTOR_IS_IMMUTABLE_MSG)
+
+    def __delattr__(self, name):
+        raise AttributeError(self.VECTOR_IS_IMMUTABLE_MSG)
+
+    def __copy__(self):
         return self
 
-    def __next__(self):
-        if self.current >= len(self.coordinates):
-            raise StopIteration
-        else:
-            current_value = self.coordinates[self.current]
-            self.current += 1
-            return current_value
-        
-    def next(self):
-        return self.__next__()
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Vector, (self.coordinates, self.backend))
+
+    def __iter__(self):
+        return iter(self.coordinates)
 
     def __len__(self):
         return len(self.coordinates)
@@ -51,31 +136,57 @@ class Vector(object):
     def __eq__(self, v):
         return self.coordinates == v.coordinates
 
+    def __ne__(self, v):
+        return not self == v
+
+    def __hash__(self):
+        return hash(self.coordinates)
+
     def is_zero(self):
-        return set(self.coordinates) == set([Decimal(0)])
+        if self._is_zero is None:
+            is_zero = not any(self.coordinates)
+            object.__setattr__(self, '_is_zero', is_zero)
+        return self._is_zero
 
     def plus(self, other):
+        if other.is_sparse:
+            return other.plus(self)
         new_coordinates = [x + y for x, y in zip(self.coordinates, other.coordinates)]
-        return Vector(new_coordinates)
+        return Vector(new_coordinates, self.backend)
 
     def minus(self, other):
+        if other.is_sparse:
+            return self.plus(other.times_scalar(-1))
         return Vector([coords[0] - coords[1]
-                       for coords in zip(self.coordinates, other.coordinates)])
+                       for coords in zip(self.coordinates, other.coordinates)],
+                      self.backend)
 
     def times_scalar(self, factor):
-        return Vector([Decimal(factor) * coord for coord in self.coordinates])
+        factor = BACKEND_CONVERTERS[self.backend](factor)
+        return Vector([factor * coord for coord in self.coordinates],
+                      self.backend)
 
     def magnitude(self):
-        return Decimal(sqrt(sum([coord * coord
-                                 for coord in self.coordinates])))
+        if self._magnitude is None:
+            convert = BACKEND_CONVERTERS[self.backend]
+            magnitude = convert(sqrt(sum([coord * coord
+                                          for coord in self.coordinates])))
+            object.__setattr__(self, '_magnitude', magnitude)
+        return self._magnitude
 
     def normalize(self):
-        try:
-            return self.times_scalar(Decimal('1.0') / self.magnitude())
-        except ZeroDivisionError:
-            raise Exception('Cannot normalize the zero vector')
+        if self._normalized is None:
+            try:
+                one = BACKEND_CONVERTERS[self.backend]('1.0')
+                normalized = self.times_scalar(one / self.magnitude())
+                object.__setattr__(self, '_normalized', normalized)
+            except ZeroDivisionError:
+                raise Exception('Cannot normalize the zero vector')
+        return self._normalized
 
     def dot_product(self, other):
+        if other.is_sparse:
+            return other.dot_product(self)
         return sum(x * y for x, y in zip(self.coordinates, other.coordinates))
 
     def get_angle_rad(self, other):
@@ -109,7 +220,7 @@ class Vector(object):
         x = (y1 * z2) - (y2 * z1)
         y = -((x1 * z2) - (x2 * z1))
         z = (x1 * y2) - (x2 * y1)
-        return Vector([x, y, z])
+        return Vector([x, y, z], self.backend)
 
     def area_parallelogram(self, other):
         return self.cross_product(other).magnitude()
@@ -0,0 +1,235 @@
+import numpy as np
+from vector import Vector
+
+DEFAULT_CHUNK_SIZE = 1024
+
+
+class VectorBatch(object):
+    """
+    Stack of N vectors of the same dimension stored as an N x d float array.
+
+    Offers the same operations as Vector, but every call runs as a single
+    vectorized kernel over all the rows instead of one Python loop per vector.
+    Operations that take `other` accept either another VectorBatch with the
+    same number of rows or a single Vector, which is broadcast to every row.
+    """
+
+    CANNOT_NORMALIZE_ZERO_VECTOR_MSG = 'Cannot normalize the zero vector'
+    BATCH_MUST_BE_NONEMPTY_MSG = 'The batch must contain at least one vector'
+    ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG = ('All vectors in the batch should '
+                                           'live in the same dimension')
+    CROSS_PRODUCT_ONLY_DEFINED_IN_3D_MSG = ('The cross product is only '
+                                            'defined for 3 dimensional '
+                                            'vectors')
+
+    def __init__(self, coordinates):
+        try:
+            coordinates = np.array(coordinates, dtype=float)
+        except ValueError:
+            raise Exception(self.ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
+
+        if coordinates.ndim == 1 and coordinates.size:
+            coordinates = coordinates.reshape(1, -1)
+
+        if coordinates.ndim != 2 or not coordinates.size:
+            raise ValueError(self.BATCH_MUST_BE_NONEMPTY_MSG)
+
+        self.coordinates = coordinates
+        self.dimension = coordinates.shape[1]
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        return cls([v.coordinates for v in vectors])
+
+    def to_vectors(self):
+        return [Vector(row) for row in self.coordinates.tolist()]
+
+    def __len__(self):
+        return self.coordinates.shape[0]
+
+    def __getitem__(self, i):
+        return Vector(self.coordinates[i].tolist())
+
+    def __iter__(self):
+        for row in self.coordinates.tolist():
+            yield Vector(row)
+
+    def __str__(self):
+        return 'VectorBatch: {}'.format(np.round(self.coordinates, 3).tolist())
+
+    def __eq__(self, other):
+        return np.array_equal(self.coordinates, other.coordinates)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def _other_coordinates(self, other):
+        if isinstance(other, VectorBatch):
+            return other.coordinates
+        return np.array(other.coordinates, dtype=float).reshape(1, -1)
+
+    def is_zero(self):
+        return ~self.coordinates.any(axis=1)
+
+    def plus(self, other):
+        return VectorBatch(self.coordinates + self._other_coordinates(other))
+
+    def minus(self, other):
+        return VectorBatch(self.coordinates - self._other_coordinates(other))
+
+    def times_scalar(self, factor):
+        """
+        Multiplies every row by `factor`, which is either a single scalar or
+        one scalar per row
+        """
+        factor = np.asarray(factor, dtype=float)
+        if factor.ndim == 1:
+            factor = factor.reshape(-1, 1)
+        return VectorBatch(self.coordinates * factor)
+
+    def magnitude(self):
+        return np.sqrt(np.einsum('ij,ij->i',
+                                 self.coordinates, self.coordinates))
+
+    def normalize(self):
+        magnitudes = self.magnitude()
+        if not magnitudes.all():
+            raise Exception(self.CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
+        return VectorBatch(self.coordinates / magnitudes.reshape(-1, 1))
+
+    def dot_product(self, other):
+        """
+        Row-wise dot product, returns an array with one scalar per row
+        """
+        other_coordinates = self._other_coordinates(other)
+        return np.einsum('ij,ij->i', self.coordinates,
+                         np.broadcast_to(other_coordinates,
+                                         self.coordinates.shape))
+
+    def get_projected_vector(self, other):
+        """
+        Gets projection of every row of the batch in b
+        """
+        if not isinstance(other, VectorBatch):
+            other = VectorBatch([other.coordinates])
+        b_normalized = other.normalize()
+        return b_normalized.times_scalar(self.dot_product(b_normalized))
+
+    def get_orthogonal_vector(self, other):
+        return self.minus(self.get_projected_vector(other))
+
+    def cross_product(self, other):
+        other_coordinates = self._other_coordinates(other)
+        if self.dimension != 3 or other_coordinates.shape[1] != 3:
+            raise Exception(self.CROSS_PRODUCT_ONLY_DEFINED_IN_3D_MSG)
+        return VectorBatch(np.cross(self.coordinates, other_coordinates))
+
+    def area_parallelogram(self, other):
+        return self.cross_product(other).magnitude()
+
+    def area_triangle(self, other):
+        return self.cross_product(other).magnitude() / 2
+
+    def iter_pairwise_classification(self, other=None,
+                                     chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Compares every row of the batch against every row of `other` (the
+        batch itself by default) in blocks of `chunk_size` rows, so only one
+        chunk_size x M block is alive at a time.
+
+        Yields (start, stop, angles, is_parallel, is_orthogonal) where the
+        arrays hold rows start:stop of the N x M result. Angles follow
+        Vector.get_angle_rad and are nan where either vector is zero.
+        """
+        other = as_vector_batch(self if other is None else other)
+        if other.dimension != self.dimension:
+            raise Exception(self.ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
+
+        magnitudes = self.magnitude()
+        other_magnitudes = other.magnitude()
+        other_is_zero = other_magnitudes == 0
+        other_transposed = other.coordinates.T
+
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            dot_products = np.dot(self.coordinates[start:stop],
+                                  other_transposed)
+            norms = np.outer(magnitudes[start:stop], other_magnitudes)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cosines = np.round(dot_products / norms, 3)
+            angles = np.arccos(np.clip(cosines, -1, 1))
+
+            is_zero = (magnitudes[start:stop] == 0).reshape(-1, 1)
+            is_parallel = is_zero | other_is_zero | (np.abs(cosines) == 1)
+            is_orthogonal = np.round(dot_products, 3) == 0
+
+            yield start, stop, angles, is_parallel, is_orthogonal
+
+    def pairwise_classification(self, other=None,
+                                chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Returns the N x M matrices (angles, is_parallel, is_orthogonal) for
+        every pair of rows, see iter_pairwise_classification
+        """
+        other = as_vector_batch(self if other is None else other)
+        shape = (len(self), len(other))
+        angles = np.empty(shape)
+        is_parallel = np.empty(shape, dtype=bool)
+        is_orthogonal = np.empty(shape, dtype=bool)
+
+        for start, stop, chunk_angles, chunk_parallel, chunk_orthogonal in \
+                self.iter_pairwise_classification(other, chunk_size):
+            angles[start:stop] = chunk_angles
+            is_parallel[start:stop] = chunk_parallel
+            is_orthogonal[start:stop] = chunk_orthogonal
+
+        return angles, is_parallel, is_orthogonal
+
+
+def as_vector_batch(vectors):
+    if isinstance(vectors, VectorBatch):
+        return vectors
+    if isinstance(vectors, np.ndarray):
+        return VectorBatch(vectors)
+    return VectorBatch.from_vectors(vectors)
+
+
+if __name__ == '__main__':
+    v = VectorBatch([[8.218, -9.341], [7.119, 8.215]])
+    w = VectorBatch([[-1.129, 2.111], [8.223, -0.878]])
+    print('addition: {}'.format(v.plus(w)))
+    print('subtraction: {}'.format(v.minus(w)))
+
+    v = VectorBatch([[-0.221, 7.437], [5.581, -2.136]])
+    print('magnitudes: {}'.format(np.round(v.magnitude(), 3).tolist()))
+    print('normalization: {}'.format(v.normalize()))
+
+    v = VectorBatch([[3.039, 1.879], [-9.88, -3.264]])
+    w = Vector([0.825, 2.036])
+    print('projected vectors: {}'.format(v.get_projected_vector(w)))
+    print('orthogonal vectors: {}'.format(v.get_orthogonal_vector(w)))
+
+    vectors = [Vector([3.009, -6.172, 3.692, -2.51]),
+               Vector([6.404, -9.144, 2.759, 8.718])]
+    batch = VectorBatch.from_vectors(vectors)
+    for v in batch.to_vectors():
+        print('round trip: {}'.format(v))
+
+    v = VectorBatch([[8.462, 7.893, -8.187], [-8.987, -9.838, 5.031],
+                     [1.5, 9.547, 3.691]])
+    w = VectorBatch([[6.984, -5.975, 4.778], [-4.268, -1.861, -8.866],
+                     [-6.007, 0.124, 5.772]])
+    print('cross products: {}'.format(v.cross_product(w)))
+    print('areas parallelogram: {}'.format(
+        np.round(v.area_parallelogram(w), 3).tolist()))
+    print('areas triangle: {}'.format(
+        np.round(v.area_triangle(w), 3).tolist()))
+
+    vectors = [Vector([-7.579, -7.88]), Vector([22.737, 23.64]),
+               Vector([2.118, 4.827]), Vector([0, 0])]
+    angles, is_parallel, is_orthogonal = \
+        VectorBatch.from_vectors(vectors).pairwise_classification()
+    print('pairwise angles: {}'.format(np.round(angles, 3).tolist()))
+    print('pairwise parallel: {}'.format(is_parallel.tolist()))
+    print('pairwise orthogonal: {}'.format(is_orthogonal.tolist()))
@@ -0,0 +1,161 @@
+import numpy as np
+from vector import Vector
+from vector_batch import as_vector_batch
+
+EXACT_MODE = 'exact'
+LSH_MODE = 'lsh'
+
+
+class CosineIndex(object):
+    """
+    Nearest-neighbour index answering top-k cosine similarity and angle
+    queries over a fixed collection of vectors.
+
+    The rows are normalized once and stored in one contiguous array. The
+    exact mode scans them as blocked matrix multiplies. The lsh mode hashes
+    every row with random hyperplanes (sign of the dot product with each
+    hyperplane) into `num_tables` tables of `num_bits` bits, and only ranks
+    the rows sharing a bucket with the query. If a query collects fewer than
+    k candidates it falls back to the exact scan.
+    """
+
+    UNKNOWN_MODE_MSG = 'The mode must be either exact or lsh'
+    ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG = ('The queries should live in the '
+                                           'same dimension as the index')
+
+    def __init__(self, vectors, mode=EXACT_MODE, block_size=4096,
+                 num_tables=8, num_bits=12, seed=None):
+        if mode not in (EXACT_MODE, LSH_MODE):
+            raise ValueError(self.UNKNOWN_MODE_MSG)
+
+        self.rows = np.ascontiguousarray(
+            as_vector_batch(vectors).normalize().coordinates)
+        self.dimension = self.rows.shape[1]
+        self.mode = mode
+        self.block_size = block_size
+
+        if mode == LSH_MODE:
+            random_state = np.random.RandomState(seed)
+            self.hyperplanes = random_state.standard_normal(
+                (num_tables, num_bits, self.dimension))
+            self.bit_weights = 1 << np.arange(num_bits, dtype=np.int64)
+            self.tables = [self._build_table(keys)
+                           for keys in self._hash(self.rows)]
+
+    def __len__(self):
+        return self.rows.shape[0]
+
+    def _hash(self, rows):
+        """
+        Returns one array of bucket keys per table
+        """
+        return [np.dot(np.dot(rows, hyperplanes.T) > 0, self.bit_weights)
+                for hyperplanes in self.hyperplanes]
+
+    @staticmethod
+    def _build_table(keys):
+        order = np.argsort(keys, kind='mergesort')
+        unique_keys, starts = np.unique(keys[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        return dict((key, order[start:end]) for key, start, end
+                    in zip(unique_keys.tolist(), starts, ends))
+
+    def _normalized_queries(self, queries):
+        single = isinstance(queries, Vector)
+        batch = as_vector_batch([queries] if single else queries)
+        if batch.dimension != self.dimension:
+            raise Exception(self.ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
+        return batch.normalize().coordinates, single
+
+    def _exact_top_k(self, queries, k):
+        best_indices = np.empty((len(queries), 0), dtype=np.int64)
+        best_cosines = np.empty((len(queries), 0))
+
+        for start in range(0, len(self), self.block_size):
+            block = self.rows[start:start + self.block_size]
+            cosines = np.hstack([best_cosines, np.dot(queries, block.T)])
+            indices = np.hstack([
+                best_indices,
+                np.broadcast_to(np.arange(start, start + len(block)),
+                                (len(queries), len(block)))])
+
+            if cosines.shape[1] > k:
+                keep = np.argpartition(-cosines, k - 1, axis=1)[:, :k]
+                cosines = np.take_along_axis(cosines, keep, axis=1)
+                indices = np.take_along_axis(indices, keep, axis=1)
+
+            best_cosines, best_indices = cosines, indices
+
+        return best_indices, best_cosines
+
+    def _lsh_top_k(self, queries, k):
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        cosines = np.empty((len(queries), k))
+        query_keys = self._hash(queries)
+
+        for i, query in enumerate(queries):
+            buckets = [table.get(keys[i]) for table, keys
+                       in zip(self.tables, query_keys)]
+            buckets = [bucket for bucket in buckets if bucket is not None]
+            candidates = (np.unique(np.concatenate(buckets)) if buckets
+                          else np.empty(0, dtype=np.int64))
+
+            if len(candidates) < k:
+                exact_indices, exact_cosines = \
+                    self._exact_top_k(query.reshape(1, -1), k)
+                indices[i], cosines[i] = exact_indices[0], exact_cosines[0]
+                continue
+
+            candidate_cosines = np.dot(self.rows[candidates], query)
+            keep = np.argpartition(-candidate_cosines, k - 1)[:k]
+            indices[i] = candidates[keep]
+            cosines[i] = candidate_cosines[keep]
+
+        return indices, cosines
+
+    def query(self, queries, k=1):
+        """
+        Returns (indices, cosines) of the k most similar rows, most similar
+        first. Both are arrays of length k for a single Vector, and Q x k
+        arrays for a VectorBatch or list of vectors.
+        """
+        queries, single = self._normalized_queries(queries)
+        k = min(k, len(self))
+
+        if self.mode == LSH_MODE:
+            indices, cosines = self._lsh_top_k(queries, k)
+        else:
+            indices, cosines = self._exact_top_k(queries, k)
+
+        order = np.argsort(-cosines, axis=1, kind='mergesort')
+        indices = np.take_along_axis(indices, order, axis=1)
+        cosines = np.take_along_axis(cosines, order, axis=1)
+
+        if single:
+            return indices[0], cosines[0]
+        return indices, cosines
+
+    def query_angles(self, queries, k=1):
+        """
+        Same as query but returns the angles in radians, smallest first
+        """
+        indices, cosines = self.query(queries, k)
+        return indices, np.arccos(np.clip(cosines, -1, 1))
+
+
+if __name__ == '__main__':
+    vectors = [Vector([7.887, 4.138]), Vector([-8.802, 6.776]),
+               Vector([3.183, -7.627]), Vector([-2.668, 5.319])]
+    index = CosineIndex(vectors)
+    indices, angles = index.query_angles(Vector([-5.955, 4.904]), k=2)
+    print('closest vectors: {} at angles {}'.format(
+        indices.tolist(), np.round(angles, 3).tolist()))
+
+    random_state = np.random.RandomState(0)
+    corpus = random_state.standard_normal((20000, 32))
+    queries = corpus[:5] + 0.05 * random_state.standard_normal((5, 32))
+    exact = CosineIndex(corpus)
+    approximate = CosineIndex(corpus, mode=LSH_MODE, seed=0)
+    print('exact nearest: {}'.format(exact.query(queries)[0].ravel().tolist()))
+    print('lsh nearest: {}'.format(
+        approximate.query(queries)[0].ravel().tolist()))